@@ -11,21 +11,35 @@ import os
 import io
 import re
 import gc
+import html
 import json
+import time
+import zlib
+import hashlib
+import sqlite3
 import random
 import threading
+import queue
+import socket
 import webbrowser
 import ctypes
 import logging
 import atexit
+import weakref
+import asyncio
 from abc import ABC, abstractmethod
-from urllib.parse import quote
-from typing import List, Dict, Optional, Tuple, Any, Set, Callable
-from functools import wraps
-from collections import OrderedDict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote, urlsplit
+from typing import List, Dict, Optional, Tuple, Any, Set, Callable, Awaitable, Coroutine, AsyncIterator, Iterator, Deque
+from functools import wraps, partial, lru_cache
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import CancelledError as FutureCancelledError
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntEnum
 from datetime import datetime
 from tkinter import messagebox, filedialog
 
@@ -33,10 +47,10 @@ import requests
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import tkinter as tk
-from PIL import Image, ImageTk, ImageDraw
-from bs4 import BeautifulSoup
-from urllib3.util.retry import Retry
+from PIL import Image, ImageTk, ImageDraw, features
+from bs4 import BeautifulSoup, SoupStrainer
 from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
 
 
 # ============================================================================
@@ -119,6 +133,32 @@ class SearchSource(Enum):
     VNDB = "VNDB"
 
 
+class CircuitState(Enum):
+    """熔断器状态"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class Priority(IntEnum):
+    """请求优先级，数值越小越优先；沿 contextvar 随协程传递"""
+    INTERACTIVE = 0  # 用户可见的搜索与当前封面
+    SNIFF = 1  # VNDB 嗅探补全
+    BACKGROUND = 2  # 预取、预热、熔断探测、后台重新验证
+    
+    @staticmethod
+    def current() -> 'Priority':
+        return _current_priority.get()
+    
+    @contextmanager
+    def scope(self):
+        token = _current_priority.set(self)
+        try:
+            yield self
+        finally:
+            _current_priority.reset(token)
+
+
 class SearchState(Enum):
     """搜索状态"""
     IDLE = "idle"
@@ -133,6 +173,8 @@ class UIText:
     LOADING = "🔄 加载中..."
     SEARCHING = "🔍 并行搜索中..."
     SEARCHING_CAT = "🐱 正在全力寻找喵..."
+    STILL_SEARCHING = " 继续搜索中..."
+    CIRCUIT_OPEN = "暂不可用"
     NO_RESULT = "无结果"
     NOT_FOUND = "😿 呜呜...什么都没找到..."
     IMAGE_FAILED = "[😭 图片跑丢了]"
@@ -158,24 +200,64 @@ class Colors:
 
 class Timeouts:
     """超时配置"""
-    REQUEST = 8
+    REQUEST = 8  # 读超时默认值，样本不足时使用
     IMAGE = 10
+    CONNECT = 4
+    CONNECT_MIN = 1.5
+    CONNECT_MAX = 6
+    READ_MIN = 2
+    READ_MAX = 20
+    REQUEST_BUDGET = 15  # 单个请求含重试的总预算
+    SEARCH_BUDGET = 25  # 一次搜索（含嗅探）的总预算
+    IMAGE_BUDGET = 15  # 一张封面（含解析地址）的总预算
     DEBOUNCE_MS = 300
     TOAST_DURATION_MS = 1200
     LOG_REFRESH_MS = 2000
+    SINGLE_FLIGHT_TTL = 5
+    HOST_BACKOFF = 5
+    HOST_BACKOFF_MAX = 120
+    CIRCUIT_COOLDOWN = 30
+    CIRCUIT_COOLDOWN_MAX = 300
+    HEDGE_MIN_DELAY = 0.5  # 对冲请求的最短等待
+    DNS_TTL = 300
+    WARM_IDLE = 60  # 空闲超过该时长视为长连接可能已被服务器关闭
+    PAGE_MEMO_TTL = 300
+    PREFETCH_DELAY = 0.3  # 预取前等待，并作为交互加载进行时的让路间隔
+    PRIORITY_AGING = 2.0  # 排队每满该时长，有效优先级提升一级
 
 
 class Limits:
     """数量限制配置"""
     MAX_RESULTS = 5
-    MAX_WORKERS = 4
+    IO_WORKERS = 32
+    DECODE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))  # 图片解码/缩放
     RETRY_TIMES = 3
     RETRY_BACKOFF = 0.5
-    POOL_CONNECTIONS = 5
-    POOL_MAXSIZE = 10
-    IMAGE_CACHE_SIZE = 20
+    RETRY_BACKOFF_MAX = 3.0
+    POOL_CONNECTIONS = 16  # 每主机一个连接池，需覆盖所有站点与图床（至少 8 个），否则预热的长连接会被挤掉
+    POOL_MAXSIZE = 16
+    IMAGE_CACHE_MAX_MB = 8  # 内存中编码后的成品封面
+    PHOTO_CACHE_SIZE = 3  # 同时存活的 PhotoImage：当前封面 + 少量前后
+    COVER_LOADERS = 2  # 同时加载的封面数
+    SCHEDULER_SLOTS = 16  # 同时在途的请求总数（各主机限流之外的全局上限）
+    PREFETCH_COVERS = 3  # 沿浏览方向预取的封面数
+    PREFETCH_BUDGET_MB = 2  # 单批预取放入内存缓存的成品字节上限
     MEMORY_THRESHOLD_MB = 200
     SEARCH_CACHE_SIZE = 10
+    SINGLE_FLIGHT_MEMO_SIZE = 64
+    PAGE_MEMO_SIZE = 64
+    HTTP_CACHE_MAX_MB = 64
+    COVER_CACHE_MAX_MB = 48
+    DLSITE_MAX_IN_FLIGHT = 4
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    LATENCY_WINDOW = 200  # 每个主机保留的最近耗时样本数
+    HEDGE_MIN_SAMPLES = 20
+    HEDGE_PERCENTILE = 0.95
+    HEDGE_BUDGET_RATIO = 0.1  # 对冲请求占全部请求的比例上限
+    HEDGE_BURST = 2
+    ADAPTIVE_TIMEOUT_MIN_SAMPLES = 10
+    STREAM_CHUNK = 8 * 1024
+    STREAM_DRAIN_BYTES = 32 * 1024  # 剩余不超过该大小时读完，保住长连接
 
 
 class UISize:
@@ -187,10 +269,13 @@ class UISize:
 class APIEndpoints:
     """API 端点配置"""
     VNDB_API = "https://api.vndb.org/kana/vn"
+    VNDB_RELEASE_API = "https://api.vndb.org/kana/release"
     DLSITE_BASE = "https://www.dlsite.com"
     DLSITE_MODES = ("maniax", "pro")
     FANZA_SEARCH = "https://www.dmm.co.jp/search/=/searchstr={}/floor=digital/group=adult/"
     FANZA_DETAIL = "https://dlsoft.dmm.co.jp/detail/{}/"
+    DLSITE_COVER = "https://img.dlsite.jp/modpub/images2/work/{category}/{bucket}/{gid}_img_main.jpg"
+    FANZA_COVER = "https://pics.dmm.co.jp/digital/pcgame/{gid}/{gid}pl.jpg"
     
     @classmethod
     def dlsite_search(cls, mode: str, keyword: str) -> str:
@@ -207,6 +292,31 @@ class APIEndpoints:
     @classmethod
     def fanza_detail(cls, gid: str) -> str:
         return cls.FANZA_DETAIL.format(gid)
+    
+    @classmethod
+    def dlsite_cover(cls, gid: str) -> str:
+        """按 DLsite 图片目录规则推导封面：作品按编号向上取整到千位分目录"""
+        prefix, digits = gid[:2].upper(), gid[2:]
+        if prefix not in ("RJ", "VJ") or not digits.isdigit():
+            return ""
+        bucket = f"{prefix}{(int(digits) + 999) // 1000 * 1000:0{len(digits)}d}"
+        category = "professional" if prefix == "VJ" else "doujin"
+        return cls.DLSITE_COVER.format(category=category, bucket=bucket, gid=prefix + digits)
+    
+    @classmethod
+    def fanza_cover(cls, gid: str) -> str:
+        return cls.FANZA_COVER.format(gid=gid)
+
+
+# 磁盘 HTTP 缓存策略: 主机 -> (新鲜期秒数, 过期后仍可先用再后台刷新的秒数)
+HTTP_CACHE_POLICIES: Dict[str, Tuple[int, int]] = {
+    "www.dlsite.com": (30 * 60, 24 * 3600),
+    "www.dmm.co.jp": (30 * 60, 24 * 3600),
+    "dlsoft.dmm.co.jp": (6 * 3600, 7 * 24 * 3600),
+    "api.vndb.org": (3600, 24 * 3600),
+    "vndb.org": (24 * 3600, 7 * 24 * 3600),
+    # 图片主机不在此列：封面缩放后存入 CoverCache，原图再存一份只会占双倍磁盘并白费压缩
+}
 
 
 class Cookies:
@@ -232,6 +342,7 @@ class Templates:
     FOUND_WITH_SNIFF = "✅ 找到 {count} 个🧈! (含 {sniff_count} 个VNDB嗅探)"
     COPIED_ID = "已复制: {id}"
     LOG_STATUS = "共 {count} 条 | 📊 INFO: {info} | ⚠️ WARN: {warn} | ❌ ERR: {err} | 📁 {size}"
+    DEGRADED = " ⚠️ {sources} 暂不可用"
     
     @classmethod
     def format_found(cls, count: int, sniff_count: int = 0) -> str:
@@ -239,6 +350,12 @@ class Templates:
             return cls.FOUND_WITH_SNIFF.format(count=count, sniff_count=sniff_count)
         return cls.FOUND_RESULTS.format(count=count)
     
+    @classmethod
+    def format_degraded(cls, sources: List['SearchSource']) -> str:
+        if not sources:
+            return ""
+        return cls.DEGRADED.format(sources="/".join(s.value for s in sources))
+    
     @classmethod
     def format_log_status(cls, count: int, stats: Dict[str, int], size: str) -> str:
         return cls.LOG_STATUS.format(
@@ -288,11 +405,30 @@ class Patterns:
     """正则表达式模式集合"""
     DLSITE_CLEAN = re.compile(r'[【】$$$$$$（）~～！!\s]')
     DLSITE_LINK = re.compile(r'href="(https://www\.dlsite\.com/[^"]+?/product_id/((?:RJ|VJ)\d+)\.html)"')
+    # 搜索结果页单个作品区块内的字段
+    DLSITE_ITEM_TITLE = re.compile(r'title="([^"]*)"')
+    # 只认作品图目录下的 _img_main / _img_sam，徽章、图标等图片不会被当成封面
+    DLSITE_ITEM_THUMB = re.compile(
+        r'(?:data-src|src)="((?:https?:)?//img\.dlsite\.jp/(?:resize|modpub)/images2/[^"]+?'
+        r'_img_(?:main|sam)(?:_\d+x\d+)?\.(?:jpe?g|png|webp))"',
+        re.IGNORECASE
+    )
+    # 搜索结果列表容器（缩略图模式的 ul / 列表模式的 table）
+    DLSITE_RESULT_LIST = re.compile(
+        r'<(ul|table|div)\b[^>]*(?:id="search_result_img_box"|class="[^"]*\bn_worklist\b[^"]*")[^>]*>'
+    )
+    DLSITE_ITEM_CIRCLE = re.compile(r'maker_name[^>]*>\s*<a[^>]*>([^<]+)</a>')
+    DLSITE_ITEM_PRICE = re.compile(r'class="work_price[^"]*"[^>]*>\s*([\d,]+)')
+    DLSITE_THUMB_SUFFIX = re.compile(r'_img_(?:sam|main)(?:_\d+x\d+)?\.\w+$')
     FANZA_PREFIX = re.compile(r'^(?:【[^】]+】)?(?:デジタル\|?)?(?:還元)?(?:アダルト)?(?:PC)?(?:ゲーム)?\s*')
     FANZA_ID = re.compile(r'/detail/([a-zA-Z0-9_]+)')
     VNDB_SNIFF_DLSITE = re.compile(r'(?:product_id|/id)/([RV]J\d+)(?:\.html)?', re.IGNORECASE)
     VNDB_SNIFF_DMM = re.compile(r'(?:cid=|/detail/)([a-z0-9_]+?)(?:/|$|\?)', re.IGNORECASE)
     OG_IMAGE = re.compile(r'<meta property="og:image" content="(.*?)"')
+    
+    # 流式读取的截止标记
+    HTML_HEAD_END = re.compile(rb'</head\s*>', re.IGNORECASE)
+    DLSITE_WORK_NAME_END = re.compile(rb'id="work_name".*?</h1>', re.DOTALL)
     GEOMETRY = re.compile(r'^\d+x\d+(\+\d+\+\d+)?$')
     
     # ID 匹配模式
@@ -314,6 +450,42 @@ class Patterns:
         return any(p.search(gid) for p in cls.NON_GAME_PATTERNS)
 
 
+# ============================================================================
+# HTML 解析
+# ============================================================================
+
+def _detect_html_parser() -> str:
+    """优先使用 C 实现的 lxml，未安装时退回标准库 html.parser"""
+    try:
+        import lxml  # noqa: F401
+        return 'lxml'
+    except ImportError:
+        return 'html.parser'
+
+
+HTML_PARSER = _detect_html_parser()
+
+
+class Strainers:
+    """各调用点只构建需要的子树（命中的元素连同其后代保留，其余丢弃）
+    
+    注意：解析阶段 class 属性还是原始字符串，多 class 元素要用正则匹配
+    """
+    DLSITE_PAGE = SoupStrainer(['h1', 'meta'])
+    FANZA_PAGE = SoupStrainer(['h1', 'meta', 'title', 'a', 'img'])
+    FANZA_ITEMS = SoupStrainer(
+        ['li', 'div'],
+        class_=re.compile(r'(?:^|\s)(?:tmb-list-item|t-item)(?:\s|$)')
+    )
+    FANZA_LINKS = SoupStrainer(['a', 'img'])
+    ANCHORS = SoupStrainer('a', href=True)
+
+
+def parse_html(content: Any, only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """统一的 HTML 解析入口"""
+    return BeautifulSoup(content, HTML_PARSER, parse_only=only)
+
+
 # ============================================================================
 # 资源管理器
 # ============================================================================
@@ -513,103 +685,1296 @@ class MemoryMonitor:
         return False
 
 
-memory_monitor = MemoryMonitor(Limits.MEMORY_THRESHOLD_MB)
+memory_monitor = MemoryMonitor(Limits.MEMORY_THRESHOLD_MB)
+
+
+# ============================================================================
+# 缓存系统
+# ============================================================================
+
+class LRUCache:
+    """通用 LRU 缓存"""
+    
+    def __init__(self, max_size: int = 20):
+        self._cache: OrderedDict[str, Any] = OrderedDict()
+        self._max_size = max_size
+        self._lock = threading.RLock()
+        self._hits: int = 0
+        self._misses: int = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return self._cache[key]
+            self._misses += 1
+            return None
+    
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self._cache[key] = value
+            else:
+                if len(self._cache) >= self._max_size:
+                    self._cache.popitem(last=False)
+                self._cache[key] = value
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+    
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._cache
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+        return {"size": len(self._cache), "hit_rate": f"{hit_rate:.1f}%"}
+
+
+class TTLCache(LRUCache):
+    """带过期时间的 LRU 缓存"""
+    
+    def __init__(self, max_size: int = 20, ttl: float = 60):
+        super().__init__(max_size)
+        self._ttl = ttl
+    
+    def get(self, key: str) -> Optional[Any]:
+        entry = super().get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self._ttl:
+            return None
+        return value
+    
+    def set(self, key: str, value: Any) -> None:
+        super().set(key, (time.monotonic(), value))
+
+
+class ImageCache(LRUCache):
+    """图片缓存 - 存编码后的成品封面字节而非解码后的像素，按总字节数 LRU 淘汰"""
+    
+    def __init__(self, max_bytes: int):
+        super().__init__(max_size=sys.maxsize)
+        self._max_bytes = max_bytes
+        self._bytes: int = 0
+    
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._bytes += len(value) - len(self._cache.pop(key, b''))
+            self._cache[key] = value
+            # 至少保留刚放入的一项
+            while self._bytes > self._max_bytes and len(self._cache) > 1:
+                _, evicted = self._cache.popitem(last=False)
+                self._bytes -= len(evicted)
+    
+    def clear(self) -> None:
+        with self._lock:
+            super().clear()
+            self._bytes = 0
+        gc.collect()
+        logger.info("图片缓存已清空")
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return dict(super().stats, bytes=f"{self._bytes / 1024:.0f}KB")
+    
+    def cleanup_if_needed(self) -> None:
+        if memory_monitor.should_cleanup():
+            self.clear()
+
+
+# ============================================================================
+# 异步引擎
+# ============================================================================
+
+class AsyncEngine:
+    """异步引擎 - 单个事件循环线程承载所有搜索、嗅探与图片协程"""
+    
+    def __init__(self, io_workers: int = Limits.IO_WORKERS, cpu_workers: int = Limits.DECODE_WORKERS):
+        self._io_workers = io_workers
+        self._cpu_workers = cpu_workers
+        self._io_executor: Optional[ThreadPoolExecutor] = None
+        self._cpu_executor: Optional[ThreadPoolExecutor] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+    
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._start()
+            return self._loop
+    
+    def _start(self) -> None:
+        # requests 为阻塞 I/O，统一交给有界线程池，事件循环线程只负责调度
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=self._io_workers,
+            thread_name_prefix="ButterFetch-io"
+        )
+        # 图片解码、缩放为 CPU 密集（PIL 释放 GIL），单独的小线程池，不与网络请求抢线程
+        self._cpu_executor = ThreadPoolExecutor(
+            max_workers=self._cpu_workers,
+            thread_name_prefix="ButterFetch-decode"
+        )
+        loop = asyncio.new_event_loop()
+        loop.set_default_executor(self._io_executor)
+        
+        started = threading.Event()
+        
+        def run_loop():
+            asyncio.set_event_loop(loop)
+            loop.call_soon(started.set)
+            loop.run_forever()
+        
+        self._thread = threading.Thread(target=run_loop, name="ButterFetch-loop", daemon=True)
+        self._thread.start()
+        started.wait()
+        self._loop = loop
+        logger.info("异步引擎已启动")
+    
+    def in_loop_thread(self) -> bool:
+        return self._thread is not None and threading.current_thread() is self._thread
+    
+    def submit(self, coro: Coroutine[Any, Any, Any], token: Optional['CancelToken'] = None) -> Future:
+        """提交协程到事件循环，返回线程安全的 Future
+        
+        给出令牌时协程在其作用域内运行（各层据此中止读取、跳过剩余步骤），取消令牌即取消协程
+        """
+        if token is None:
+            return asyncio.run_coroutine_threadsafe(coro, self.loop)
+        future = asyncio.run_coroutine_threadsafe(self._scoped(token, coro), self.loop)
+        token.add_callback(future.cancel)
+        return future
+    
+    @staticmethod
+    async def _scoped(token: 'CancelToken', coro: Coroutine[Any, Any, Any]) -> Any:
+        with token.scope():
+            return await coro
+    
+    def run(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        timeout: Optional[float] = None,
+        token: Optional['CancelToken'] = None
+    ) -> Any:
+        """同步外观 - 在调用线程阻塞等待协程结果；令牌取消时抛出 RequestCancelled"""
+        if self.in_loop_thread():
+            coro.close()
+            raise RuntimeError("不能在事件循环线程内同步等待协程")
+        
+        future = self.submit(coro, token)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+        except FutureCancelledError:
+            raise RequestCancelled("操作已取消")
+    
+    async def run_blocking(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """在 I/O 线程池中执行阻塞调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, partial(func, *args, **kwargs))
+    
+    async def run_cpu(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """在解码线程池中执行 CPU 密集调用"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._cpu_executor, partial(func, *args, **kwargs))
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        
+        async def cancel_all():
+            current = asyncio.current_task()
+            for task in asyncio.all_tasks():
+                if task is not current:
+                    task.cancel()
+        
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(timeout=1)
+        except Exception:
+            pass
+        
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread:
+            self._thread.join(timeout=1)
+        # 循环线程已退出才能关闭；否则留给解释器回收
+        if not (self._thread and self._thread.is_alive()):
+            loop.close()
+        # 排队中的阻塞任务直接丢弃（3.9+），进行中的下载已由 shutdown_token 中止
+        options = {'cancel_futures': True} if sys.version_info >= (3, 9) else {}
+        for executor in (self._io_executor, self._cpu_executor):
+            if executor:
+                executor.shutdown(wait=False, **options)
+        logger.info("异步引擎已关闭")
+
+
+async_engine = AsyncEngine()
+
+
+# ============================================================================
+# HTTP 磁盘缓存
+# ============================================================================
+
+@dataclass
+class CachedResponse:
+    """磁盘缓存中的响应"""
+    url: str
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    expires_at: float
+    stale_until: float
+    etag: str = ""
+    last_modified: str = ""
+    
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+    
+    def is_servable_stale(self, now: float) -> bool:
+        return now < self.stale_until
+    
+    def to_response(self) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = self.status
+        resp.reason = "OK"
+        resp.url = self.url
+        resp.headers = requests.structures.CaseInsensitiveDict(self.headers)
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp._content = self.body
+        resp.from_cache = True
+        return resp
+
+
+class HttpCache:
+    """HTTP 响应磁盘缓存 - sqlite3 存储，zlib 压缩响应体"""
+    
+    # 响应体已解码，这些头不能原样回放
+    _DROP_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+    
+    def __init__(self, db_path: str, max_bytes: int):
+        self._db_path = db_path
+        self._max_bytes = max_bytes
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._stores_since_prune: int = 0
+        self._hits: int = 0
+        self._misses: int = 0
+        self._revalidated: int = 0
+    
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self._db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, url TEXT, status INTEGER, headers TEXT,"
+                " body BLOB, size INTEGER, expires_at REAL, stale_until REAL,"
+                " etag TEXT, last_modified TEXT, accessed_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at)"
+            )
+        return self._conn
+    
+    @staticmethod
+    def policy_for(url: str) -> Optional[Tuple[int, int]]:
+        return HTTP_CACHE_POLICIES.get(urlsplit(url).hostname or "")
+    
+    @staticmethod
+    def make_key(method: str, url: str, body: Any = None) -> str:
+        raw = f"{method} {url}"
+        if body is not None:
+            raw += " " + json.dumps(body, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    
+    def lookup(self, key: str) -> Optional[CachedResponse]:
+        try:
+            with self._lock:
+                conn = self._connect()
+                row = conn.execute(
+                    "SELECT url, status, headers, body, expires_at, stale_until, etag, last_modified"
+                    " FROM responses WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if row is None:
+                    self._misses += 1
+                    return None
+                conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                self._hits += 1
+            
+            url, status, headers, body, expires_at, stale_until, etag, last_modified = row
+            return CachedResponse(
+                url=url,
+                status=status,
+                headers=json.loads(headers),
+                body=zlib.decompress(body),
+                expires_at=expires_at,
+                stale_until=stale_until,
+                etag=etag or "",
+                last_modified=last_modified or ""
+            )
+        except Exception as e:
+            logger.warning(f"HTTP缓存读取失败: {e}")
+            return None
+    
+    def store(self, key: str, resp: requests.Response, policy: Tuple[int, int]) -> None:
+        if resp.status_code != 200 or 'no-store' in resp.headers.get('Cache-Control', ''):
+            return
+        
+        ttl, stale = policy
+        now = time.time()
+        headers = {
+            k: v for k, v in resp.headers.items()
+            if k.lower() not in self._DROP_HEADERS
+        }
+        body = zlib.compress(resp.content, 6)
+        
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key, resp.url, resp.status_code, json.dumps(headers), body, len(body),
+                        now + ttl, now + ttl + stale,
+                        resp.headers.get('ETag', ''), resp.headers.get('Last-Modified', ''), now
+                    )
+                )
+                conn.commit()
+                self._stores_since_prune += 1
+                if self._stores_since_prune >= 50:
+                    self._stores_since_prune = 0
+                    self._prune(conn)
+        except Exception as e:
+            logger.warning(f"HTTP缓存写入失败: {e}")
+    
+    def refresh(self, key: str, policy: Tuple[int, int]) -> None:
+        """304 重新验证成功，续期"""
+        ttl, stale = policy
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "UPDATE responses SET expires_at = ?, stale_until = ?, accessed_at = ? WHERE key = ?",
+                    (now + ttl, now + ttl + stale, now, key)
+                )
+                conn.commit()
+                self._revalidated += 1
+        except Exception as e:
+            logger.warning(f"HTTP缓存续期失败: {e}")
+    
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """超出容量时按最近访问时间淘汰"""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self._max_bytes:
+            return
+        
+        target = total - int(self._max_bytes * 0.9)
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at"):
+            doomed.append((key,))
+            freed += size
+            if freed >= target:
+                break
+        conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+        conn.commit()
+        logger.info(f"HTTP缓存淘汰 {len(doomed)} 条, 释放 {freed / 1024:.0f}KB")
+    
+    def clear(self) -> None:
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            logger.info("HTTP缓存已清空")
+        except Exception as e:
+            logger.warning(f"HTTP缓存清空失败: {e}")
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._conn:
+                self._conn.close()
+                self._conn = None
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+        return {
+            "hit_rate": f"{hit_rate:.1f}%",
+            "revalidated": self._revalidated
+        }
+
+
+http_cache = HttpCache(
+    resource_path("butterfetch_cache.db"),
+    Limits.HTTP_CACHE_MAX_MB * 1024 * 1024
+)
+resource_manager.register(http_cache.close, "HttpCache")
+
+
+# ============================================================================
+# 封面磁盘缓存
+# ============================================================================
+
+class CoverCache:
+    """成品封面磁盘缓存 - 存缩放、加圆角之后的图片，按地址与渲染参数索引
+    
+    索引是一个 JSON 文件，按最近使用顺序记录 (key, 字节数)，总大小超限时淘汰最久未用的。
+    写入、淘汰只标记索引已变更，距上次保存满 INDEX_FLUSH_INTERVAL 秒才落盘，退出时再保存一次
+    """
+    
+    INDEX_FILE = "index.json"
+    INDEX_FLUSH_INTERVAL = 30.0
+    
+    def __init__(self, directory: str, max_bytes: int, render_params: str):
+        self._dir = directory
+        self._max_bytes = max_bytes
+        self._render_params = render_params
+        self._format, self._ext = ('WEBP', '.webp') if features.check('webp') else ('PNG', '.png')
+        self._index: Optional[OrderedDict[str, int]] = None
+        self._total: int = 0
+        self._dirty: bool = False
+        self._last_save: float = time.monotonic()
+        self._lock = threading.Lock()
+        self._hits: int = 0
+        self._misses: int = 0
+    
+    def _ensure_index(self) -> 'OrderedDict[str, int]':
+        if self._index is None:
+            self._index = OrderedDict()
+            try:
+                with open(os.path.join(self._dir, self.INDEX_FILE), 'r', encoding='utf-8') as f:
+                    for key, size in json.load(f):
+                        self._index[key] = size
+            except (OSError, ValueError, TypeError):
+                pass
+            self._total = sum(self._index.values())
+        return self._index
+    
+    def make_key(self, url: str) -> str:
+        return hashlib.sha1(f"{url}|{self._render_params}|{self._format}".encode('utf-8')).hexdigest()
+    
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, key + self._ext)
+    
+    def encode(self, image: Image.Image) -> bytes:
+        """编码为缓存格式；内存层与磁盘层存同一份字节"""
+        buffer = io.BytesIO()
+        image.save(buffer, self._format, quality=90)
+        return buffer.getvalue()
+    
+    def __contains__(self, url: str) -> bool:
+        key = self.make_key(url)
+        with self._lock:
+            return key in self._ensure_index()
+    
+    def load(self, url: str) -> Optional[bytes]:
+        key = self.make_key(url)
+        with self._lock:
+            index = self._ensure_index()
+            if key not in index:
+                self._misses += 1
+                return None
+            index.move_to_end(key)
+            self._dirty = True
+        
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self._forget(key)
+            self._misses += 1
+            return None
+        
+        self._hits += 1
+        return data
+    
+    def store(self, url: str, data: bytes) -> None:
+        key = self.make_key(url)
+        
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            tmp_path = self._path(key) + ".tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"封面缓存写入失败: {e}")
+            return
+        
+        with self._lock:
+            index = self._ensure_index()
+            self._total += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            self._dirty = True
+            self._evict()
+            self._flush_if_due()
+    
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            size = self._ensure_index().pop(key, None)
+            if size is not None:
+                self._total -= size
+                self._dirty = True
+    
+    def _evict(self) -> None:
+        """超出容量时淘汰到 90%"""
+        if self._total <= self._max_bytes:
+            return
+        
+        target = int(self._max_bytes * 0.9)
+        evicted = 0
+        while self._index and self._total > target:
+            key, size = self._index.popitem(last=False)
+            self._total -= size
+            evicted += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+        self._dirty = True
+        logger.info(f"封面缓存淘汰 {evicted} 张")
+    
+    def _flush_if_due(self) -> None:
+        """索引有变更且距上次保存已满间隔时落盘，调用方持有锁"""
+        if self._dirty and time.monotonic() - self._last_save >= self.INDEX_FLUSH_INTERVAL:
+            self._save_index()
+    
+    def _save_index(self) -> None:
+        """临时文件写完再原子替换，中途退出不会留下半截索引"""
+        self._last_save = time.monotonic()
+        try:
+            os.makedirs(self._dir, exist_ok=True)
+            tmp_path = os.path.join(self._dir, self.INDEX_FILE + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._index.items()), f)
+            os.replace(tmp_path, os.path.join(self._dir, self.INDEX_FILE))
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"封面缓存索引保存失败: {e}")
+    
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._ensure_index():
+                try:
+                    os.remove(self._path(key))
+                except OSError:
+                    pass
+            self._index.clear()
+            self._total = 0
+            self._save_index()
+        logger.info("封面缓存已清空")
+    
+    def close(self) -> None:
+        """退出时保存索引（最近使用顺序及未落盘的写入、淘汰）"""
+        with self._lock:
+            if self._dirty and self._index is not None:
+                self._save_index()
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        total = self._hits + self._misses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
+        return {
+            "count": len(self._index or {}),
+            "size": f"{self._total / 1024 / 1024:.1f}MB",
+            "hit_rate": f"{hit_rate:.1f}%"
+        }
+
+
+cover_cache = CoverCache(
+    resource_path("cover_cache"),
+    Limits.COVER_CACHE_MAX_MB * 1024 * 1024,
+    render_params=f"h{UISize.IMG_HEIGHT}-r{UISize.CORNER_RADIUS}"
+)
+resource_manager.register(cover_cache.close, "CoverCache")
+
+
+# ============================================================================
+# 网络服务
+# ============================================================================
+
+@dataclass
+class _Flight:
+    """进行中的合并请求"""
+    task: asyncio.Future
+    token: 'CancelToken'
+    priority: Priority = Priority.INTERACTIVE
+    waiters: int = 0
+
+
+@dataclass
+class HostPolicy:
+    """单主机限流策略"""
+    concurrency: int  # 同时进行的请求上限
+    rate: float  # 令牌桶每秒补充数
+    burst: int  # 令牌桶容量
+
+
+HOST_POLICIES: Dict[str, HostPolicy] = {
+    "www.dlsite.com": HostPolicy(concurrency=6, rate=6.0, burst=10),
+    "www.dmm.co.jp": HostPolicy(concurrency=4, rate=4.0, burst=6),
+    "dlsoft.dmm.co.jp": HostPolicy(concurrency=4, rate=4.0, burst=6),
+    "api.vndb.org": HostPolicy(concurrency=3, rate=1.0, burst=5),
+    "vndb.org": HostPolicy(concurrency=3, rate=2.0, burst=5),
+}
+
+DEFAULT_HOST_POLICY = HostPolicy(concurrency=4, rate=5.0, burst=8)
+
+# 各优先级同时在途的请求上限；低优先级即使排到队首也只能占用少量槽位
+PRIORITY_LIMITS: Dict[Priority, int] = {
+    Priority.INTERACTIVE: 16,
+    Priority.SNIFF: 8,
+    Priority.BACKGROUND: 2,
+}
+
+# 启动和空闲后预热的主机
+WARM_UP_HOSTS: Tuple[str, ...] = ("www.dlsite.com", "www.dmm.co.jp", "dlsoft.dmm.co.jp", "api.vndb.org")
+
+
+class DnsCache:
+    """进程内 DNS 缓存 - 包装 socket.getaddrinfo，成功结果按 TTL 复用"""
+    
+    def __init__(self, ttl: float = Timeouts.DNS_TTL, max_size: int = 64):
+        self._cache = TTLCache(max_size, ttl)
+        self._resolve = socket.getaddrinfo
+        self.hits: int = 0
+    
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        key = f"{host}|{port}|{family}|{type}|{proto}|{flags}"
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return list(cached)
+        # 解析失败不缓存，交由调用方处理
+        result = self._resolve(host, port, family, type, proto, flags)
+        self._cache.set(key, tuple(result))
+        return result
+    
+    def install(self) -> None:
+        """替换进程级 socket.getaddrinfo，由应用启动时调用，导入模块不产生副作用"""
+        if socket.getaddrinfo != self.getaddrinfo:
+            socket.getaddrinfo = self.getaddrinfo
+    
+    def uninstall(self) -> None:
+        if socket.getaddrinfo == self.getaddrinfo:
+            socket.getaddrinfo = self._resolve
+    
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+dns_cache = DnsCache()
+resource_manager.register(dns_cache.uninstall, "DnsCache")
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """解析 Retry-After（秒数或 HTTP 日期）"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostLimiter:
+    """单主机限流器 - 并发上限 + 令牌桶 + 429 退避"""
+    
+    def __init__(self, host: str, policy: HostPolicy):
+        self.host = host
+        self.policy = policy
+        self._semaphore = asyncio.Semaphore(policy.concurrency)
+        self._bucket_lock = asyncio.Lock()
+        self._tokens: float = float(policy.burst)
+        self._refilled_at: float = time.monotonic()
+        self._blocked_until: float = 0.0
+        self._backoff: float = Timeouts.HOST_BACKOFF
+        self.in_flight: int = 0
+        self.throttled: int = 0
+        self.last_used: float = 0.0
+    
+    async def _take_token(self, deadline: Optional['Deadline'] = None) -> None:
+        await _wait_within(self._bucket_lock.acquire(), deadline, f"[{self.host}] 等待令牌桶")
+        try:
+            while True:
+                now = time.monotonic()
+                if now < self._blocked_until:
+                    wait = self._blocked_until - now
+                else:
+                    self._tokens = min(
+                        float(self.policy.burst),
+                        self._tokens + (now - self._refilled_at) * self.policy.rate
+                    )
+                    self._refilled_at = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.policy.rate
+                
+                # 退避或补充令牌要等的时间超出剩余预算时立即放弃，不白等
+                if deadline is not None and wait > deadline.remaining():
+                    raise BudgetExhausted(f"[{self.host}] 限流等待 {wait:.1f}s 超出剩余预算")
+                await asyncio.sleep(wait)
+        finally:
+            self._bucket_lock.release()
+    
+    @asynccontextmanager
+    async def slot(self, deadline: Optional['Deadline'] = None):
+        """占用主机槽位；给出 deadline 时各项等待都不超过剩余预算"""
+        await _wait_within(self._semaphore.acquire(), deadline, f"[{self.host}] 等待主机槽位")
+        try:
+            await self._take_token(deadline)
+            self.in_flight += 1
+            try:
+                yield
+            finally:
+                self.in_flight -= 1
+                self.last_used = time.monotonic()
+        finally:
+            self._semaphore.release()
+    
+    @property
+    def idle_for(self) -> float:
+        """距上次请求的时长；从未请求时视为无限久"""
+        return time.monotonic() - self.last_used if self.last_used else float('inf')
+    
+    def back_off(self, retry_after: Optional[float]) -> None:
+        """被限流后暂停该主机；无 Retry-After 时指数退避"""
+        if retry_after is None:
+            delay = self._backoff
+            self._backoff = min(self._backoff * 2, Timeouts.HOST_BACKOFF_MAX)
+        else:
+            delay = min(retry_after, Timeouts.HOST_BACKOFF_MAX)
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+        self.throttled += 1
+        logger.warning(f"[{self.host}] 被限流，暂停 {delay:.1f}s")
+    
+    def on_success(self) -> None:
+        self._backoff = Timeouts.HOST_BACKOFF
+    
+    @property
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": self.in_flight,
+            "tokens": round(self._tokens, 1),
+            "blocked_for": round(max(0.0, self._blocked_until - time.monotonic()), 1),
+            "throttled": self.throttled
+        }
+
+
+class HostScheduler:
+    """按主机调度请求，慢主机不会占满全部 I/O 线程"""
+    
+    def __init__(self, policies: Dict[str, HostPolicy]):
+        self._policies = dict(policies)
+        self._limiters: Dict[str, HostLimiter] = {}
+    
+    def configure(self, host: str, policy: HostPolicy) -> None:
+        """调整主机策略，下次创建限流器时生效"""
+        self._policies[host] = policy
+        self._limiters.pop(host, None)
+    
+    def limiter_for(self, url: str) -> HostLimiter:
+        # 限流器内含 asyncio 原语，只能在事件循环线程中创建和使用
+        host = urlsplit(url).hostname or ""
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = HostLimiter(host, self._policies.get(host, DEFAULT_HOST_POLICY))
+            self._limiters[host] = limiter
+        return limiter
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {host: limiter.stats for host, limiter in self._limiters.items()}
+
+
+_current_priority: ContextVar[Priority] = ContextVar('priority', default=Priority.INTERACTIVE)
+
+
+@dataclass
+class _Waiter:
+    """排队中的请求"""
+    priority: Priority
+    enqueued: float
+    seq: int
+    future: asyncio.Future
+    tag: Any = None
+
+
+class PriorityScheduler:
+    """请求准入调度 - 全局槽位按优先级分配
+    
+    每级有独立并发上限；空出的槽位交给有效优先级最高的排队者，
+    有效优先级随排队时长提升（老化），低优先级不会被持续的交互请求饿死。
+    只在事件循环线程中使用。
+    """
+    
+    def __init__(
+        self,
+        total: int = Limits.SCHEDULER_SLOTS,
+        limits: Optional[Dict[Priority, int]] = None,
+        aging: float = Timeouts.PRIORITY_AGING
+    ):
+        self._total = total
+        self._limits = dict(limits or PRIORITY_LIMITS)
+        self._aging = aging
+        self._waiters: List[_Waiter] = []
+        self._seq: int = 0
+        self._running: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._admitted: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._wait_total: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._wait_max: Dict[Priority, float] = {p: 0.0 for p in Priority}
+        self._boosted: 'weakref.WeakKeyDictionary[Any, Priority]' = weakref.WeakKeyDictionary()
+    
+    @asynccontextmanager
+    async def slot(
+        self,
+        priority: Optional[Priority] = None,
+        tag: Any = None,
+        deadline: Optional['Deadline'] = None
+    ):
+        """占用一个请求槽位；tag 用于之后 promote 同一请求，给出 deadline 时排队不超过剩余预算"""
+        if priority is None:
+            priority = Priority.current()
+        if tag is not None:
+            priority = min(priority, self._boosted.get(tag, priority))
+        
+        self._seq += 1
+        waiter = _Waiter(priority, time.monotonic(), self._seq, asyncio.get_running_loop().create_future(), tag)
+        self._waiters.append(waiter)
+        self._dispatch()
+        
+        if not waiter.future.done():
+            try:
+                await _wait_within(waiter.future, deadline, "排队等待请求槽位")
+            except (asyncio.CancelledError, BudgetExhausted):
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                elif waiter.future.done() and not waiter.future.cancelled():
+                    # 刚被放行就被取消，槽位要还回去
+                    self._release(waiter.priority)
+                raise
+        
+        try:
+            yield
+        finally:
+            self._release(waiter.priority)
+    
+    def promote(self, tag: Any, priority: Priority) -> None:
+        """提升某请求（含之后的重试）的优先级，避免高优先级调用方等在低优先级请求后面"""
+        if tag is None or priority >= self._boosted.get(tag, Priority.BACKGROUND + 1):
+            return
+        self._boosted[tag] = priority
+        for waiter in self._waiters:
+            if waiter.tag is tag and priority < waiter.priority:
+                waiter.priority = priority
+        self._dispatch()
+    
+    def _effective(self, waiter: _Waiter, now: float) -> Tuple[float, int]:
+        return waiter.priority - (now - waiter.enqueued) / self._aging, waiter.seq
+    
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self._waiters and sum(self._running.values()) < self._total:
+            ready = [w for w in self._waiters if self._running[w.priority] < self._limits[w.priority]]
+            if not ready:
+                return
+            waiter = min(ready, key=lambda w: self._effective(w, now))
+            self._waiters.remove(waiter)
+            
+            waited = now - waiter.enqueued
+            self._running[waiter.priority] += 1
+            self._admitted[waiter.priority] += 1
+            self._wait_total[waiter.priority] += waited
+            self._wait_max[waiter.priority] = max(self._wait_max[waiter.priority], waited)
+            waiter.future.set_result(None)
+    
+    def _release(self, priority: Priority) -> None:
+        self._running[priority] -= 1
+        self._dispatch()
+    
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """各优先级的在途数、排队深度与等待时间"""
+        stats = {}
+        for p in Priority:
+            admitted = self._admitted[p]
+            stats[p.name.lower()] = {
+                "running": self._running[p],
+                "queued": sum(1 for w in self._waiters if w.priority == p),
+                "admitted": admitted,
+                "avg_wait_ms": round(self._wait_total[p] / admitted * 1000, 1) if admitted else 0.0,
+                "max_wait_ms": round(self._wait_max[p] * 1000, 1),
+            }
+        return stats
+
+
+class BudgetExhausted(requests.Timeout):
+    """截止时间预算耗尽"""
+
+
+class RequestCancelled(requests.RequestException):
+    """请求已被取消（结果不再需要）"""
+
+
+_current_cancel: ContextVar[Optional['CancelToken']] = ContextVar('cancel_token', default=None)
+
+
+class CancelToken:
+    """协作式取消令牌 - 跨线程可见，阻塞的下载在数据块之间检查并中止
+    
+    子令牌在父令牌取消时同样视为已取消（回调只随自身的 cancel 触发）；
+    所有长期令牌都挂在 shutdown_token 下，程序退出时一并失效。
+    """
+    
+    def __init__(self, parent: Optional['CancelToken'] = None):
+        self._parent = parent
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+    
+    def child(self) -> 'CancelToken':
+        return CancelToken(parent=self)
+    
+    def cancel(self) -> None:
+        with self._lock:
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+    
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """取消时调用（已取消则立即调用），用于唤醒不在数据块循环里的等待方"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self._parent is not None and self._parent.cancelled)
+    
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise RequestCancelled("请求已取消")
+    
+    @staticmethod
+    def current() -> Optional['CancelToken']:
+        return _current_cancel.get()
+    
+    @staticmethod
+    def check() -> None:
+        """当前上下文的令牌已取消时抛出 RequestCancelled，供循环在各步之间调用"""
+        token = _current_cancel.get()
+        if token is not None:
+            token.raise_if_cancelled()
+    
+    @contextmanager
+    def scope(self):
+        token = _current_cancel.set(self)
+        try:
+            yield self
+        finally:
+            _current_cancel.reset(token)
+
+
+# 程序退出时取消，进行中的下载在下一个数据块处中止
+shutdown_token = CancelToken()
+
+
+_current_deadline: ContextVar[Optional['Deadline']] = ContextVar('deadline', default=None)
+
+
+class Deadline:
+    """截止时间预算 - 通过上下文变量在协程间传递"""
+    
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + budget
+    
+    @staticmethod
+    def current() -> Optional['Deadline']:
+        return _current_deadline.get()
+    
+    @classmethod
+    def within_current(cls, budget: float) -> 'Deadline':
+        """新建预算，但不超过当前上下文剩余的预算"""
+        deadline = cls(budget)
+        outer = cls.current()
+        if outer is not None and outer.expires_at < deadline.expires_at:
+            deadline.expires_at = outer.expires_at
+        return deadline
+    
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+    
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+    
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+    
+    @contextmanager
+    def scope(self):
+        token = _current_deadline.set(self)
+        try:
+            yield self
+        finally:
+            _current_deadline.reset(token)
+
+
+async def _wait_within(awaitable: Awaitable, deadline: Optional[Deadline], what: str) -> Any:
+    """等待不超过剩余预算，超时抛出 BudgetExhausted；无预算时照常等待"""
+    if deadline is None:
+        return await awaitable
+    try:
+        return await asyncio.wait_for(awaitable, deadline.remaining())
+    except asyncio.TimeoutError:
+        raise BudgetExhausted(f"{what}时预算耗尽 ({deadline.elapsed:.1f}s)") from None
 
 
-# ============================================================================
-# 缓存系统
-# ============================================================================
+@dataclass(frozen=True)
+class RetryPolicy:
+    """统一重试策略 - 仅幂等请求重试，退避带随机抖动且受预算约束"""
+    max_attempts: int = Limits.RETRY_TIMES
+    base_delay: float = Limits.RETRY_BACKOFF
+    max_delay: float = Limits.RETRY_BACKOFF_MAX
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    
+    def attempts_for(self, idempotent: bool) -> int:
+        return self.max_attempts if idempotent else 1
+    
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: 在 [0, min(上限, base * 2^n)] 内随机"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
 
-class LRUCache:
-    """通用 LRU 缓存"""
+
+class LatencyTracker:
+    """滚动耗时窗口，按键（主机:请求类型）估计分位数"""
     
-    def __init__(self, max_size: int = 20):
-        self._cache: OrderedDict[str, Any] = OrderedDict()
-        self._max_size = max_size
-        self._lock = threading.RLock()
-        self._hits: int = 0
-        self._misses: int = 0
+    def __init__(self, window: int = Limits.LATENCY_WINDOW):
+        self._window = window
+        self._samples: Dict[str, Deque[float]] = {}
     
-    def get(self, key: str) -> Optional[Any]:
-        with self._lock:
-            if key in self._cache:
-                self._cache.move_to_end(key)
-                self._hits += 1
-                return self._cache[key]
-            self._misses += 1
+    @staticmethod
+    def key(url: str, kind: str) -> str:
+        return f"{urlsplit(url).hostname or ''}:{kind}"
+    
+    def record(self, key: str, seconds: float) -> None:
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self._window)
+        samples.append(seconds)
+    
+    def count(self, key: str) -> int:
+        samples = self._samples.get(key)
+        return len(samples) if samples else 0
+    
+    def percentile(self, key: str, q: float, min_samples: int = 1) -> Optional[float]:
+        samples = self._samples.get(key)
+        if not samples or len(samples) < min_samples:
             return None
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            key: {
+                "samples": len(samples),
+                "p50": round(self.percentile(key, 0.5), 3),
+                "p95": round(self.percentile(key, 0.95), 3),
+                "p99": round(self.percentile(key, 0.99), 3),
+            }
+            for key, samples in self._samples.items() if samples
+        }
+
+
+@dataclass(frozen=True)
+class TimeoutPolicy:
+    """自适应超时 - 由首字节/总耗时的 p99 乘以系数得出，并限制在上下限之内"""
+    factor: float = 3.0
+    percentile: float = 0.99
+    min_samples: int = Limits.ADAPTIVE_TIMEOUT_MIN_SAMPLES
+    connect_bounds: Tuple[float, float] = (Timeouts.CONNECT_MIN, Timeouts.CONNECT_MAX)
+    read_bounds: Tuple[float, float] = (Timeouts.READ_MIN, Timeouts.READ_MAX)
     
-    def set(self, key: str, value: Any) -> None:
-        with self._lock:
-            if key in self._cache:
-                self._cache.move_to_end(key)
-                self._cache[key] = value
-            else:
-                if len(self._cache) >= self._max_size:
-                    self._cache.popitem(last=False)
-                self._cache[key] = value
+    def _derive(self, tracker: LatencyTracker, key: str, bounds: Tuple[float, float]) -> Optional[float]:
+        p = tracker.percentile(key, self.percentile, self.min_samples)
+        if p is None:
+            return None
+        low, high = bounds
+        return round(min(high, max(low, p * self.factor)), 2)
     
-    def clear(self) -> None:
-        with self._lock:
-            self._cache.clear()
+    def for_request(
+        self,
+        first_byte: LatencyTracker,
+        total: LatencyTracker,
+        key: str,
+        kind: str
+    ) -> Tuple[float, float]:
+        """返回 (connect, read)；样本不足时退回固定默认值"""
+        connect = self._derive(first_byte, key, self.connect_bounds)
+        read = self._derive(total, key, self.read_bounds)
+        return (
+            connect if connect is not None else Timeouts.CONNECT,
+            read if read is not None else (Timeouts.IMAGE if kind == "image" else Timeouts.REQUEST)
+        )
+
+
+@dataclass
+class HedgePolicy:
+    """对冲请求策略 - 首个请求超过主机耗时分位数仍未返回时，换新连接再发一次"""
+    percentile: float = Limits.HEDGE_PERCENTILE
+    min_samples: int = Limits.HEDGE_MIN_SAMPLES
+    min_delay: float = Timeouts.HEDGE_MIN_DELAY
+    budget_ratio: float = Limits.HEDGE_BUDGET_RATIO
+    burst: int = Limits.HEDGE_BURST
+    # 统计
+    eligible: int = 0
+    hedged: int = 0
+    wins: int = 0
+    denied: int = 0
+    
+    def delay_for(self, latency: LatencyTracker, key: str) -> Optional[float]:
+        """样本不足时不对冲，避免凭空猜测"""
+        p = latency.percentile(key, self.percentile, self.min_samples)
+        if p is None:
+            return None
+        return max(self.min_delay, p)
     
-    def __contains__(self, key: str) -> bool:
-        with self._lock:
-            return key in self._cache
+    def try_spend(self) -> bool:
+        """对冲预算：总数不超过可对冲请求数的固定比例（外加少量突发）"""
+        if self.hedged >= self.eligible * self.budget_ratio + self.burst:
+            self.denied += 1
+            return False
+        self.hedged += 1
+        return True
     
     @property
     def stats(self) -> Dict[str, Any]:
-        total = self._hits + self._misses
-        hit_rate = (self._hits / total * 100) if total > 0 else 0
-        return {"size": len(self._cache), "hit_rate": f"{hit_rate:.1f}%"}
+        return {
+            "eligible": self.eligible,
+            "hedged": self.hedged,
+            "wins": self.wins,
+            "denied": self.denied,
+            "win_rate": round(self.wins / self.hedged, 2) if self.hedged else 0.0
+        }
 
 
-class ImageCache(LRUCache):
-    """图片缓存"""
-    
-    def __init__(self, max_size: int = 20):
-        super().__init__(max_size)
-    
-    def clear(self) -> None:
-        super().clear()
-        gc.collect()
-        logger.info("图片缓存已清空")
+def _wire_bytes_read(resp: requests.Response) -> Optional[int]:
+    """已从连接读走的原始（未解压）字节数；底层不支持时返回 None"""
+    try:
+        return int(resp.raw.tell())
+    except (AttributeError, OSError, TypeError, ValueError):
+        return None
+
+
+def _read_until(
+    resp: requests.Response,
+    until: Optional['re.Pattern[bytes]'] = None,
+    cancel: Optional[CancelToken] = None,
+    deadline: Optional[Deadline] = None
+) -> requests.Response:
+    """流式读取响应体，命中截止标记即停止下载，令牌取消或预算耗尽时中止下载；resp.content 为已读部分"""
+    buffer = bytearray()
+    complete = True
+    try:
+        for chunk in resp.iter_content(Limits.STREAM_CHUNK):
+            if cancel is not None and cancel.cancelled:
+                raise RequestCancelled(f"下载已取消: {resp.url[:60]}")
+            if deadline is not None and deadline.expired:
+                raise BudgetExhausted(f"读取响应时预算耗尽: {resp.url[:60]}")
+            buffer += chunk
+            if until is not None and until.search(buffer):
+                complete = False
+                break
+        
+        if not complete:
+            # 剩余不多时读完，连接可以放回连接池复用；否则直接断开。
+            # Content-Length 是线上（压缩后）字节数，只能与已从套接字读走的字节比较，不能与解压后的 buffer 比
+            length = resp.headers.get('Content-Length', '')
+            consumed = _wire_bytes_read(resp)
+            if (length.isdigit() and consumed is not None
+                    and int(length) - consumed <= Limits.STREAM_DRAIN_BYTES):
+                for _ in resp.iter_content(Limits.STREAM_CHUNK):
+                    pass
+    finally:
+        resp.close()
     
-    def cleanup_if_needed(self) -> None:
-        if memory_monitor.should_cleanup():
-            self.clear()
+    resp._content = bytes(buffer)
+    resp._content_consumed = True
+    resp.truncated = not complete
+    return resp
 
 
-# ============================================================================
-# 网络服务
-# ============================================================================
+def _clamp_timeout(timeout: Any, remaining: float) -> Any:
+    """单次尝试的超时不超过剩余预算"""
+    if isinstance(timeout, tuple):
+        return tuple(min(t, remaining) for t in timeout)
+    return min(timeout, remaining)
+
 
 class NetworkService:
     """网络请求服务"""
     
     def __init__(self):
         self._session: Optional[requests.Session] = None
+        self._revalidating: Set[str] = set()
+        self._inflight: Dict[str, '_Flight'] = {}
+        self._recent = TTLCache(Limits.SINGLE_FLIGHT_MEMO_SIZE, Timeouts.SINGLE_FLIGHT_TTL)
+        self._coalesced: int = 0
+        self.hosts = HostScheduler(HOST_POLICIES)
+        self.scheduler = PriorityScheduler()
+        self.retry_policy = RetryPolicy()
+        self.latency = LatencyTracker()
+        self.first_byte = LatencyTracker()
+        self.timeout_policy = TimeoutPolicy()
+        self.hedge_policy = HedgePolicy()
+        self._hedge_session: Optional[requests.Session] = None
+        self._warming: bool = False
         self._create_session()
     
-    def _create_session(self) -> None:
-        self._session = requests.Session()
-        
-        retry = Retry(
-            total=Limits.RETRY_TIMES,
-            backoff_factor=Limits.RETRY_BACKOFF,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["GET", "POST"]
-        )
+    @staticmethod
+    def _new_session() -> requests.Session:
+        session = requests.Session()
         
+        # 重试统一由 RetryPolicy 负责，连接池层不再重试
         adapter = HTTPAdapter(
-            max_retries=retry,
+            max_retries=0,
             pool_connections=Limits.POOL_CONNECTIONS,
             pool_maxsize=Limits.POOL_MAXSIZE
         )
         
-        self._session.mount('http://', adapter)
-        self._session.mount('https://', adapter)
-        
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _create_session(self) -> None:
+        self._session = self._new_session()
         logger.info("网络服务初始化完成")
     
     @property
@@ -618,43 +1983,378 @@ class NetworkService:
             self._create_session()
         return self._session
     
-    def reset_session(self) -> None:
+    @property
+    def hedge_session(self) -> requests.Session:
+        """对冲请求使用独立连接池，不会排在卡住的连接后面"""
+        if self._hedge_session is None:
+            self._hedge_session = self._new_session()
+        return self._hedge_session
+    
+    def _send(
+        self,
+        method: str,
+        url: str,
+        hedge: bool = False,
+        until: Optional['re.Pattern[bytes]'] = None,
+        cancel: Optional[CancelToken] = None,
+        deadline: Optional[Deadline] = None,
+        **kwargs
+    ) -> requests.Response:
+        session = self.hedge_session if hedge else self.session
+        if cancel is not None:
+            cancel.raise_if_cancelled()
         try:
-            if self._session:
-                self._session.close()
-        except Exception:
-            pass
-        self._create_session()
-        logger.debug("网络连接已重置")
+            if until is None and cancel is None:
+                return session.request(method, url, **kwargs)
+            # 带令牌的请求都流式读取，取消或预算耗尽时在数据块之间中止下载
+            return _read_until(session.request(method, url, stream=True, **kwargs), until, cancel, deadline)
+        except requests.ConnectionError as e:
+            # 响应体读取中途超时会被 requests 包装成 ConnectionError，还原为 ReadTimeout 以便计入耗时样本
+            if e.args and isinstance(e.args[0], ReadTimeoutError):
+                raise requests.ReadTimeout(e, request=e.request) from e
+            raise
+    
+    def get(self, url: str, token: Optional[CancelToken] = None, **kwargs) -> requests.Response:
+        """同步外观 - 取消令牌会中止进行中的读取"""
+        return async_engine.run(self.aget(url, **kwargs), token=token)
+    
+    def post(self, url: str, token: Optional[CancelToken] = None, **kwargs) -> requests.Response:
+        """同步外观 - 取消令牌会中止进行中的读取"""
+        return async_engine.run(self.apost(url, **kwargs), token=token)
+    
+    async def aget(
+        self,
+        url: str,
+        cache: bool = True,
+        hedge: bool = False,
+        kind: str = "page",
+        **kwargs
+    ) -> requests.Response:
+        """hedge=True 时对慢请求发出对冲请求，适合决定整体耗时的搜索页；
+        kind 区分请求类型（page/image/probe），各自维护耗时统计与自适应超时；
+        传入 until（bytes 正则）时流式读取，命中即停止下载，只返回已读部分"""
+        kwargs.setdefault('headers', Headers.DEFAULT)
+        kwargs['kind'] = kind
+        if hedge:
+            kwargs['hedge'] = True
+        return await self._asingle_flight('GET', url, cache, **kwargs)
+    
+    async def apost(
+        self,
+        url: str,
+        cache: bool = True,
+        idempotent: bool = False,
+        **kwargs
+    ) -> requests.Response:
+        """POST 默认视为非幂等：不重试、不缓存、不合并；查询类接口传 idempotent=True"""
+        kwargs.setdefault('kind', "api")
+        if not idempotent:
+            return await self._afetch('POST', url, idempotent=False, **kwargs)
+        return await self._asingle_flight('POST', url, cache, **kwargs)
+    
+    async def _asingle_flight(self, method: str, url: str, cache: bool, **kwargs) -> requests.Response:
+        """合并并发及近期的相同（幂等）请求，共享同一次网络调用的结果"""
+        key = HttpCache.make_key(method, url, kwargs.get('json'))
+        if kwargs.get('until') is not None:
+            # 部分读取与完整读取不能互相合并
+            key = f"{key}:{kwargs['until'].pattern!r}"
+        
+        recent = self._recent.get(key)
+        if recent is not None:
+            self._coalesced += 1
+            return recent
+        
+        flight = self._inflight.get(key)
+        if flight is None:
+            token = shutdown_token.child()
+            flight = _Flight(
+                asyncio.ensure_future(self._aflight(token, method, url, cache, **kwargs)),
+                token,
+                Priority.current()
+            )
+            self._inflight[key] = flight
+            flight.task.add_done_callback(partial(self._on_flight_done, key))
+        else:
+            self._coalesced += 1
+            # 交互请求搭上预取等低优先级请求时，整个请求随之提升
+            if Priority.current() < flight.priority:
+                flight.priority = Priority.current()
+                self.scheduler.promote(flight.token, flight.priority)
+        
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            # 所有等待者都已放弃时才真正取消请求，令牌让线程里的下载一并中止
+            if flight.waiters == 0 and not flight.task.done():
+                flight.token.cancel()
+                flight.task.cancel()
+    
+    async def _aflight(self, token: CancelToken, method: str, url: str, cache: bool, **kwargs) -> requests.Response:
+        with token.scope():
+            return await self._arequest(method, url, cache, **kwargs)
+    
+    def _on_flight_done(self, key: str, task: asyncio.Future) -> None:
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        if task.result().status_code == 200:
+            self._recent.set(key, task.result())
+    
+    @property
+    def coalesced_count(self) -> int:
+        return self._coalesced
+    
+    async def _arequest(self, method: str, url: str, cache: bool, **kwargs) -> requests.Response:
+        """磁盘缓存层：新鲜直接返回，过期窗口内先返回旧值再后台重新验证"""
+        policy = http_cache.policy_for(url) if cache else None
+        if policy is None:
+            return await self._afetch(method, url, **kwargs)
+        
+        key = HttpCache.make_key(method, url, kwargs.get('json'))
+        entry = await async_engine.run_blocking(http_cache.lookup, key)
+        
+        if kwargs.get('until') is not None:
+            # 流式部分读取：可用的完整缓存直接用；否则按截止标记另存一份部分响应，
+            # 只供同一标记的部分读取使用，同样走新鲜/过期重新验证流程（304 时已读的开头仍然有效）
+            if entry is not None and entry.is_servable_stale(time.time()):
+                return entry.to_response()
+            key = f"{key}:{kwargs['until'].pattern!r}"
+            entry = await async_engine.run_blocking(http_cache.lookup, key)
+        
+        if entry is not None:
+            now = time.time()
+            if entry.is_fresh(now):
+                return entry.to_response()
+            if entry.is_servable_stale(now):
+                if key not in self._revalidating:
+                    self._revalidating.add(key)
+                    with Priority.BACKGROUND.scope():
+                        task = asyncio.ensure_future(
+                            self._arevalidate(key, entry, policy, method, url, **kwargs)
+                        )
+                    task.add_done_callback(partial(self._on_revalidated, key))
+                return entry.to_response()
+            return await self._arevalidate(key, entry, policy, method, url, **kwargs)
+        
+        resp = await self._afetch(method, url, **kwargs)
+        await async_engine.run_blocking(http_cache.store, key, resp, policy)
+        return resp
+    
+    def _on_revalidated(self, key: str, task: asyncio.Future) -> None:
+        self._revalidating.discard(key)
+        if not task.cancelled() and task.exception():
+            logger.warning(f"后台重新验证失败: {task.exception()}")
+    
+    async def _arevalidate(
+        self,
+        key: str,
+        entry: CachedResponse,
+        policy: Tuple[int, int],
+        method: str,
+        url: str,
+        **kwargs
+    ) -> requests.Response:
+        headers = dict(kwargs.get('headers') or {})
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        kwargs['headers'] = headers
+        
+        try:
+            resp = await self._afetch(method, url, **kwargs)
+        except requests.RequestException as e:
+            logger.warning(f"重新验证失败，使用缓存: {url[:60]} ({e.__class__.__name__})")
+            return entry.to_response()
+        
+        if resp.status_code == 304:
+            await async_engine.run_blocking(http_cache.refresh, key, policy)
+            return entry.to_response()
+        
+        await async_engine.run_blocking(http_cache.store, key, resp, policy)
+        return resp
     
-    def _request_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
-        for attempt in range(2):
+    async def _afetch(
+        self,
+        method: str,
+        url: str,
+        idempotent: bool = True,
+        **kwargs
+    ) -> requests.Response:
+        """按统一重试策略发送请求，总耗时受单请求预算与外层搜索预算共同约束"""
+        policy = self.retry_policy
+        attempts = policy.attempts_for(idempotent)
+        deadline = Deadline.within_current(Timeouts.REQUEST_BUDGET)
+        kind = kwargs.pop('kind', "page")
+        # 显式传入的超时优先，否则按该主机该类请求的历史耗时推算
+        timeout = kwargs.pop('timeout', None) or self.timeout_for(url, kind)
+        send = self._afetch_once
+        if kwargs.pop('hedge', False) and idempotent and method == 'GET':
+            send = self._afetch_hedged
+        
+        for attempt in range(attempts):
+            CancelToken.check()
+            remaining = deadline.remaining()
+            if remaining <= 0:
+                raise BudgetExhausted(f"请求预算耗尽 ({deadline.elapsed:.1f}s): {url[:60]}")
+            
+            last_attempt = attempt + 1 >= attempts
             try:
-                if method == 'GET':
-                    return self.session.get(url, **kwargs)
-                else:
-                    return self.session.post(url, **kwargs)
-            except (requests.exceptions.SSLError, requests.exceptions.ConnectionError) as e:
-                if attempt == 0:
-                    logger.warning(f"连接错误，重置连接重试... ({e.__class__.__name__})")
-                    self.reset_session()
-                else:
+                # 本请求的预算进入上下文，排队、限流等待与读取都受其约束
+                with deadline.scope():
+                    resp = await send(method, url, kind, timeout=timeout, **kwargs)
+            except BudgetExhausted:
+                # 预算已用完，重试也来不及
+                raise
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if last_attempt:
                     raise
-        
-        if method == 'GET':
-            return self.session.get(url, **kwargs)
-        return self.session.post(url, **kwargs)
+                logger.warning(f"请求失败，准备重试 ({attempt + 1}/{attempts}): {e.__class__.__name__}")
+            else:
+                if last_attempt or resp.status_code not in policy.retry_statuses:
+                    return resp
+                logger.warning(f"HTTP {resp.status_code}，准备重试 ({attempt + 1}/{attempts})")
+            
+            delay = policy.backoff(attempt)
+            if delay >= deadline.remaining():
+                raise BudgetExhausted(f"剩余预算不足以重试 ({deadline.elapsed:.1f}s): {url[:60]}")
+            await asyncio.sleep(delay)
+        
+        raise BudgetExhausted(url[:60])
+    
+    async def _afetch_hedged(self, method: str, url: str, kind: str, **kwargs) -> requests.Response:
+        """首个请求超过主机耗时分位数仍未返回时发出对冲请求，先到者胜"""
+        hedge_policy = self.hedge_policy
+        hedge_policy.eligible += 1
+        delay = hedge_policy.delay_for(self.latency, LatencyTracker.key(url, kind))
+        if delay is None:
+            return await self._afetch_once(method, url, kind, **kwargs)
+        
+        primary = asyncio.ensure_future(self._afetch_once(method, url, kind, **kwargs))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not hedge_policy.try_spend():
+                return await primary
+            
+            logger.info(f"请求超过 {delay:.2f}s 未返回，发出对冲请求: {url[:60]}")
+            backup = asyncio.ensure_future(self._afetch_once(method, url, kind, hedge=True, **kwargs))
+            pending = {primary, backup}
+            try:
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    # 同一轮可能两个都完成：先找成功的一方，都失败才抛出
+                    for task in done:
+                        if task.exception() is None:
+                            if task is backup:
+                                hedge_policy.wins += 1
+                            return task.result()
+                    if not pending:
+                        # 两个都失败，抛出主请求的异常
+                        return primary.result()
+            finally:
+                backup.cancel()
+        finally:
+            primary.cancel()
+        raise requests.ConnectionError(url[:60])
+    
+    async def _afetch_once(self, method: str, url: str, kind: str, **kwargs) -> requests.Response:
+        limiter = self.hosts.limiter_for(url)
+        key = LatencyTracker.key(url, kind)
+        # 没有调用方令牌的请求也随程序退出中止；读取线程看不到上下文变量，令牌与预算显式传入
+        token = CancelToken.current() or shutdown_token
+        token.raise_if_cancelled()
+        kwargs['cancel'] = token
+        deadline = kwargs['deadline'] = Deadline.current()
+        # 先过主机限流（并发、令牌桶、退避），再占全局槽位：
+        # 被限流或已满的主机只让自己的请求排队，全局槽位只计入真正能发出的请求
+        async with limiter.slot(deadline), self.scheduler.slot(tag=token, deadline=deadline):
+            if deadline is not None:
+                # 排队用掉的时间从本次尝试的超时里扣除
+                remaining = deadline.remaining()
+                if remaining <= 0:
+                    raise BudgetExhausted(f"请求发出前预算耗尽 ({deadline.elapsed:.1f}s): {url[:60]}")
+                kwargs['timeout'] = _clamp_timeout(kwargs['timeout'], remaining)
+            started = time.monotonic()
+            try:
+                resp = await async_engine.run_blocking(self._send, method, url, **kwargs)
+            except requests.ReadTimeout:
+                # 超时也计入样本（按已用超时截断），慢但健康的主机超时会逐步放宽
+                timeout = kwargs['timeout']
+                self.latency.record(key, timeout[1] if isinstance(timeout, tuple) else timeout)
+                raise
+            self.latency.record(key, time.monotonic() - started)
+            self.first_byte.record(key, resp.elapsed.total_seconds())
+        
+        if resp.status_code == 429 or (resp.status_code == 503 and 'Retry-After' in resp.headers):
+            limiter.back_off(_parse_retry_after(resp.headers.get('Retry-After', '')))
+        else:
+            limiter.on_success()
+        return resp
     
-    def get(self, url: str, **kwargs) -> requests.Response:
-        kwargs.setdefault('timeout', Timeouts.REQUEST)
-        kwargs.setdefault('headers', Headers.DEFAULT)
-        return self._request_with_retry('GET', url, **kwargs)
+    def warm_up(self) -> Future:
+        """后台预热，立即返回"""
+        return async_engine.submit(self.awarm_up())
+    
+    async def awarm_up(self, hosts: Tuple[str, ...] = WARM_UP_HOSTS) -> None:
+        """预先解析 DNS 并建立长连接；近期用过的主机连接仍然可用，跳过"""
+        with Priority.BACKGROUND.scope():
+            await self._awarm_up(hosts)
+    
+    async def _awarm_up(self, hosts: Tuple[str, ...]) -> None:
+        if self._warming:
+            return
+        
+        targets = [h for h in hosts if self.hosts.limiter_for(f"https://{h}/").idle_for >= Timeouts.WARM_IDLE]
+        if not targets:
+            return
+        
+        async def warm(host: str) -> bool:
+            url = f"https://{host}/"
+            try:
+                await self._afetch_once(
+                    'HEAD', url, "probe",
+                    timeout=self.timeout_for(url, "probe"),
+                    headers=Headers.DEFAULT,
+                    allow_redirects=False
+                )
+                return True
+            except requests.RequestException as e:
+                logger.debug(f"[{host}] 预热失败: {e.__class__.__name__}")
+                return False
+        
+        self._warming = True
+        started = time.monotonic()
+        try:
+            results = await asyncio.gather(*(warm(h) for h in targets))
+        finally:
+            self._warming = False
+        logger.info(f"连接预热 {sum(results)}/{len(targets)}，耗时 {time.monotonic() - started:.2f}s")
+    
+    def timeout_for(self, url: str, kind: str = "page") -> Tuple[float, float]:
+        """当前对该主机该类请求使用的 (connect, read) 超时"""
+        return self.timeout_policy.for_request(
+            self.first_byte, self.latency, LatencyTracker.key(url, kind), kind
+        )
     
-    def post(self, url: str, **kwargs) -> requests.Response:
-        kwargs.setdefault('timeout', Timeouts.REQUEST)
-        return self._request_with_retry('POST', url, **kwargs)
+    def latency_snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """各主机/请求类型的耗时分位数及推算出的超时，便于排查"""
+        snapshot = {}
+        for key, stats in self.latency.snapshot().items():
+            host, kind = key.rsplit(':', 1)
+            first_byte = self.first_byte.percentile(key, 0.99)
+            snapshot[key] = dict(
+                stats,
+                first_byte_p99=round(first_byte, 3) if first_byte is not None else None,
+                timeout=self.timeout_policy.for_request(self.first_byte, self.latency, key, kind)
+            )
+        return snapshot
     
     def close(self) -> None:
+        if self._hedge_session:
+            self._hedge_session.close()
+            self._hedge_session = None
         if self._session:
             self._session.close()
             self._session = None
@@ -665,6 +2365,97 @@ network = NetworkService()
 resource_manager.register(network.close, "NetworkService")
 
 
+# ============================================================================
+# 熔断器
+# ============================================================================
+
+# 半开探测请求：尽量轻量的页面或接口
+CIRCUIT_PROBES: Dict[SearchSource, str] = {
+    SearchSource.DLSITE: f"{APIEndpoints.DLSITE_BASE}/maniax/",
+    # 探测搜索实际使用的主机与路径，详情页主机正常不代表搜索可用
+    SearchSource.FANZA: APIEndpoints.fanza_search("ゲーム"),
+    SearchSource.VNDB: "https://api.vndb.org/kana/stats",
+}
+
+
+class CircuitBreaker:
+    """单来源熔断器 - 连续失败后快速失败，后台半开探测恢复"""
+    
+    def __init__(
+        self,
+        source: SearchSource,
+        failure_threshold: int = Limits.CIRCUIT_FAILURE_THRESHOLD,
+        cooldown: float = Timeouts.CIRCUIT_COOLDOWN
+    ):
+        self.source = source
+        self._failure_threshold = failure_threshold
+        self._base_cooldown = cooldown
+        self._cooldown = cooldown
+        self._state = CircuitState.CLOSED
+        self._failures: int = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> CircuitState:
+        return self._state
+    
+    def allow(self) -> bool:
+        """熔断期间（含半开探测中）直接拒绝，用户请求不承担探测成本"""
+        return self._state == CircuitState.CLOSED
+    
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+    
+    def record_failure(self) -> None:
+        with self._lock:
+            if self._state != CircuitState.CLOSED:
+                return
+            self._failures += 1
+            if self._failures < self._failure_threshold:
+                return
+            self._state = CircuitState.OPEN
+        
+        logger.warning(f"[{self.source.value}] 连续失败 {self._failures} 次，熔断 {self._cooldown:.0f}s")
+        async_engine.submit(self._probe_later())
+    
+    async def _probe_later(self) -> None:
+        while True:
+            await asyncio.sleep(self._cooldown)
+            self._state = CircuitState.HALF_OPEN
+            
+            try:
+                with Priority.BACKGROUND.scope():
+                    resp = await network.aget(CIRCUIT_PROBES[self.source], cache=False, kind="probe")
+                healthy = resp.status_code < 500
+            except requests.RequestException:
+                healthy = False
+            
+            with self._lock:
+                if healthy:
+                    self._state = CircuitState.CLOSED
+                    self._failures = 0
+                    self._cooldown = self._base_cooldown
+                else:
+                    self._state = CircuitState.OPEN
+                    self._cooldown = min(self._cooldown * 2, Timeouts.CIRCUIT_COOLDOWN_MAX)
+            
+            if healthy:
+                logger.info(f"[{self.source.value}] 探测成功，熔断恢复")
+                return
+            logger.warning(f"[{self.source.value}] 探测失败，{self._cooldown:.0f}s 后重试")
+
+
+circuit_breakers: Dict[SearchSource, CircuitBreaker] = {
+    source: CircuitBreaker(source) for source in SearchSource
+}
+
+
+def degraded_sources() -> List[SearchSource]:
+    """当前处于熔断状态的来源"""
+    return [source for source, breaker in circuit_breakers.items() if not breaker.allow()]
+
+
 # ============================================================================
 # 日志管理
 # ============================================================================
@@ -764,6 +2555,10 @@ class SearchResult:
     thumb_url: str = ""
     from_vndb: bool = False
     relevance_score: float = 0.0  # 相关性评分
+    shop_links: List[str] = field(default_factory=list)  # VNDB API 返回的商店外链
+    circle: str = ""  # 社团/品牌
+    price: Optional[int] = None  # 日元
+    cover_url: str = ""  # 搜索时即确定的封面地址，显示时无需再抓详情页
 
 
 @dataclass
@@ -773,12 +2568,31 @@ class SniffedShopInfo:
     fanza_ids: List[str] = field(default_factory=list)
 
 
+@dataclass
+class ProductPage:
+    """解析后的作品详情页"""
+    title: str
+    image_url: str = ""
+
+
+@dataclass
+class DLsiteListing:
+    """DLsite 搜索结果页中的单个作品"""
+    id: str
+    url: str
+    title: str
+    thumb_url: str = ""
+    circle: str = ""
+    price: Optional[int] = None
+
+
 @dataclass
 class SearchResponse:
     """搜索响应"""
     results: List[SearchResult] = field(default_factory=list)
     error: Optional[str] = None
     source: Optional[SearchSource] = None
+    elapsed: float = 0.0  # 实际耗时（秒）
 
 
 @dataclass
@@ -788,6 +2602,7 @@ class GroupedResults:
     fanza: List[SearchResult] = field(default_factory=list)
     vndb: List[SearchResult] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)  # 各阶段耗时
     
     def all(self) -> List[SearchResult]:
         return self.dlsite + self.fanza + self.vndb
@@ -798,6 +2613,15 @@ class GroupedResults:
     def is_empty(self) -> bool:
         return self.total_count() == 0
     
+    def copy(self) -> 'GroupedResults':
+        return GroupedResults(
+            dlsite=list(self.dlsite),
+            fanza=list(self.fanza),
+            vndb=list(self.vndb),
+            errors=list(self.errors),
+            timings=dict(self.timings)
+        )
+    
     def sniffed_count(self) -> int:
         return sum(1 for r in self.all() if r.from_vndb)
     
@@ -819,6 +2643,21 @@ class GroupedResults:
         return labels
 
 
+@dataclass
+class CoverImage:
+    """处理好的封面（PIL 图像）；PhotoImage 只能在 Tk 线程中由它创建"""
+    url: str
+    image: Image.Image
+
+
+@dataclass
+class SearchUpdate:
+    """渐进式搜索更新"""
+    grouped: GroupedResults  # 当前已排序的结果快照
+    stage: str  # 触发本次更新的来源或阶段
+    done: bool = False
+
+
 @dataclass 
 class Shortcut:
     """快捷键定义"""
@@ -1091,9 +2930,13 @@ class ISearchProvider(ABC):
     """搜索提供者接口"""
     
     @abstractmethod
-    def search(self, keyword: str) -> SearchResponse:
+    async def asearch(self, keyword: str) -> SearchResponse:
         pass
     
+    def search(self, keyword: str, token: Optional[CancelToken] = None) -> SearchResponse:
+        """同步外观 - 供事件循环以外的线程调用；取消令牌会中止进行中的请求"""
+        return async_engine.run(self.asearch(keyword), token=token)
+    
     @property
     @abstractmethod
     def source(self) -> SearchSource:
@@ -1102,21 +2945,40 @@ class ISearchProvider(ABC):
 
 def safe_search(source: SearchSource):
     """搜索安全装饰器"""
-    def decorator(func: Callable[..., List[SearchResult]]):
+    def decorator(func: Callable[..., Awaitable[List[SearchResult]]]):
         @wraps(func)
-        def wrapper(*args, **kwargs) -> SearchResponse:
+        async def wrapper(*args, **kwargs) -> SearchResponse:
+            breaker = circuit_breakers[source]
+            if not breaker.allow():
+                logger.info(f"[{source.value}] 熔断中，跳过")
+                return SearchResponse(error=UIText.CIRCUIT_OPEN, source=source)
+            
+            started = time.monotonic()
             try:
-                results = func(*args, **kwargs)
-                return SearchResponse(results=results, source=source)
+                results = await func(*args, **kwargs)
+                response = SearchResponse(results=results, source=source)
+                breaker.record_success()
+            except RequestCancelled:
+                # 主动取消不代表来源不健康，不计入熔断
+                logger.info(f"[{source.value}] 已取消")
+                response = SearchResponse(error="已取消", source=source)
             except requests.Timeout:
                 logger.warning(f"[{source.value}] 请求超时")
-                return SearchResponse(error="请求超时", source=source)
+                response = SearchResponse(error="请求超时", source=source)
+                breaker.record_failure()
             except requests.RequestException as e:
                 logger.warning(f"[{source.value}] 网络错误: {e}")
-                return SearchResponse(error="网络错误", source=source)
+                response = SearchResponse(error="网络错误", source=source)
+                breaker.record_failure()
             except Exception as e:
                 logger.error(f"[{source.value}] 未知错误: {e}")
-                return SearchResponse(error=f"错误: {str(e)[:20]}", source=source)
+                response = SearchResponse(error=f"错误: {str(e)[:20]}", source=source)
+            
+            response.elapsed = time.monotonic() - started
+            deadline = Deadline.current()
+            budget_note = f", 搜索预算剩余 {deadline.remaining():.1f}s" if deadline else ""
+            logger.info(f"[{source.value}] 耗时 {response.elapsed:.2f}s{budget_note}")
+            return response
         return wrapper
     return decorator
 
@@ -1125,29 +2987,101 @@ def safe_search(source: SearchSource):
 # ID 获取函数
 # ============================================================================
 
-def fetch_dlsite_info_by_id(gid: str) -> Optional[SearchResult]:
+product_pages = TTLCache(Limits.PAGE_MEMO_SIZE, Timeouts.PAGE_MEMO_TTL)
+
+
+def _absolute_url(url: str) -> str:
+    return ('https:' + url) if url.startswith('//') else url
+
+
+def dlsite_cover_url(gid: str, thumb_url: str = "") -> str:
+    """由搜索页缩略图换算大图；缩略图格式不认识时按 ID 规则推导"""
+    if thumb_url and Patterns.DLSITE_THUMB_SUFFIX.search(thumb_url):
+        url = Patterns.DLSITE_THUMB_SUFFIX.sub('_img_main.jpg', _absolute_url(thumb_url))
+        return url.replace('/resize/', '/modpub/')
+    return APIEndpoints.dlsite_cover(gid)
+
+
+def fanza_cover_url(gid: str, thumb_url: str = "") -> str:
+    """FANZA 缩略图 ps.jpg 对应大图 pl.jpg；没有缩略图时按 ID 规则推导"""
+    if thumb_url and 'ps.jpg' in thumb_url:
+        return _absolute_url(thumb_url.replace('ps.jpg', 'pl.jpg'))
+    return APIEndpoints.fanza_cover(gid)
+
+
+def dlsite_thumb_url(gid: str, thumb_url: str = "") -> str:
+    """DLsite 小图：搜索页给了缩略图就直接用，否则由大图换成同目录的 _img_sam"""
+    if thumb_url:
+        return _absolute_url(thumb_url)
+    cover = APIEndpoints.dlsite_cover(gid)
+    return Patterns.DLSITE_THUMB_SUFFIX.sub('_img_sam.jpg', cover) if cover else ""
+
+
+def fanza_thumb_url(gid: str, thumb_url: str = "") -> str:
+    """FANZA 小图 ps.jpg"""
+    if thumb_url and 'ps.jpg' in thumb_url:
+        return _absolute_url(thumb_url)
+    return APIEndpoints.fanza_cover(gid).replace('pl.jpg', 'ps.jpg')
+
+
+def _parse_dlsite_page(content: bytes, gid: str) -> ProductPage:
+    """解析 DLsite 作品页，一次解析同时得到标题和封面"""
+    soup = parse_html(content, Strainers.DLSITE_PAGE)
+    
+    title_tag = (
+        soup.select_one('#work_name a') or
+        soup.select_one('h1#work_name') or
+        soup.select_one('meta[property="og:title"]')
+    )
+    
+    if title_tag:
+        if title_tag.name == 'meta':
+            title = title_tag.get('content', gid)
+        else:
+            title = title_tag.get_text(strip=True)
+    else:
+        title = gid
+    
+    image_tag = soup.select_one('meta[property="og:image"]')
+    image_url = _absolute_url(image_tag.get('content', '').strip()) if image_tag else ""
+    
+    return ProductPage(title=title, image_url=image_url)
+
+
+async def aload_dlsite_page(url: str, gid: str, need_title: bool = True) -> Optional[ProductPage]:
+    """获取并解析 DLsite 作品页（短期记忆，标题与封面共用一次下载）
+    
+    只读取页面开头：标题读到 work_name 标题为止，只要封面时读到 </head>（og:image 在其中）
+    """
+    page = product_pages.get(url)
+    if page is None and not need_title:
+        page = product_pages.get(url + "#head")
+    if page is not None:
+        return page
+    
+    until = Patterns.DLSITE_WORK_NAME_END if need_title else Patterns.HTML_HEAD_END
+    resp = await network.aget(url, kind="prefix", until=until, cookies=Cookies.DLSITE)
+    if resp.status_code != 200 or gid.encode() not in resp.content:
+        return None
+    
+    page = await async_engine.run_blocking(_parse_dlsite_page, resp.content, gid)
+    product_pages.set(url if need_title else url + "#head", page)
+    return page
+
+
+async def afetch_dlsite_info_by_id(gid: str) -> Optional[SearchResult]:
     """通过 ID 获取 DLsite 游戏信息"""
+    breaker = circuit_breakers[SearchSource.DLSITE]
+    if not breaker.allow():
+        return None
+    
     try:
         for mode in APIEndpoints.DLSITE_MODES:
             url = APIEndpoints.dlsite_product(mode, gid)
-            resp = network.get(url, cookies=Cookies.DLSITE)
+            page = await aload_dlsite_page(url, gid)
             
-            if resp.status_code == 200 and gid in resp.text:
-                soup = BeautifulSoup(resp.content, 'html.parser')
-                
-                title_tag = (
-                    soup.select_one('#work_name a') or
-                    soup.select_one('h1#work_name') or
-                    soup.select_one('meta[property="og:title"]')
-                )
-                
-                if title_tag:
-                    if title_tag.name == 'meta':
-                        title = title_tag.get('content', gid)
-                    else:
-                        title = title_tag.get_text(strip=True)
-                else:
-                    title = gid
+            if page:
+                title = page.title
                 
                 logger.info(f"[DLsite] 成功获取 {gid}: {title[:30]}")
                 return SearchResult(
@@ -1155,52 +3089,95 @@ def fetch_dlsite_info_by_id(gid: str) -> Optional[SearchResult]:
                     id=gid,
                     title=title,
                     url=url,
-                    from_vndb=True
+                    from_vndb=True,
+                    cover_url=page.image_url or dlsite_cover_url(gid)
                 )
         
         logger.warning(f"[DLsite] {gid} 在所有区域都未找到")
+    except RequestCancelled:
+        logger.debug(f"[DLsite] 获取 {gid} 已取消")
     except Exception as e:
         logger.warning(f"[DLsite] 获取 {gid} 信息失败: {e}")
+        if isinstance(e, requests.RequestException):
+            breaker.record_failure()
     return None
 
 
-def fetch_fanza_info_by_id(gid: str) -> Optional[SearchResult]:
+def fetch_dlsite_info_by_id(gid: str, token: Optional[CancelToken] = None) -> Optional[SearchResult]:
+    """同步外观 - 通过 ID 获取 DLsite 游戏信息"""
+    return async_engine.run(afetch_dlsite_info_by_id(gid), token=token)
+
+
+def _parse_fanza_page(content: bytes) -> ProductPage:
+    """解析 FANZA 详情页，一次解析同时得到标题和封面"""
+    soup = parse_html(content, Strainers.FANZA_PAGE)
+    
+    title_tag = (
+        soup.select_one('h1#title') or
+        soup.select_one('h1.productTitle__txt') or
+        soup.select_one('meta[property="og:title"]') or
+        soup.select_one('title')
+    )
+    
+    title = ""
+    if title_tag:
+        if title_tag.name == 'meta':
+            title = title_tag.get('content', '')
+        else:
+            title = title_tag.get_text(strip=True)
+        
+        title = Patterns.FANZA_PREFIX.sub('', title).strip()
+        title = re.sub(r'\s*[-|｜].*(?:DMM|FANZA).*$', '', title).strip()
+    
+    image_url = ""
+    target = soup.select_one('a[name="package-image"]') or soup.select_one('#package-src')
+    if target:
+        image_url = _absolute_url(target.get('href') or target.get('src', ''))
+    
+    return ProductPage(title=title, image_url=image_url)
+
+
+async def aload_fanza_page(url: str) -> Optional[ProductPage]:
+    """获取并解析 FANZA 详情页（短期记忆，标题与封面共用一次下载）"""
+    page = product_pages.get(url)
+    if page is not None:
+        return page
+    
+    resp = await network.aget(url, cookies=Cookies.FANZA)
+    if resp.status_code != 200:
+        logger.warning(f"[FANZA] 页面请求失败: {resp.status_code} {url}")
+        return None
+    
+    page = await async_engine.run_blocking(_parse_fanza_page, resp.content)
+    product_pages.set(url, page)
+    return page
+
+
+async def afetch_fanza_info_by_id(gid: str) -> Optional[SearchResult]:
     """通过 ID 获取 FANZA 游戏信息"""
+    breaker = circuit_breakers[SearchSource.FANZA]
+    if not breaker.allow():
+        return None
+    
     try:
         url = APIEndpoints.fanza_detail(gid)
-        resp = network.get(url, cookies=Cookies.FANZA)
+        page = await aload_fanza_page(url)
         
-        if resp.status_code != 200:
-            logger.warning(f"[FANZA] {gid} 页面请求失败: {resp.status_code}")
+        if page is None:
             return None
         
-        soup = BeautifulSoup(resp.content, 'html.parser')
-        
-        title_tag = (
-            soup.select_one('h1#title') or
-            soup.select_one('h1.productTitle__txt') or
-            soup.select_one('meta[property="og:title"]') or
-            soup.select_one('title')
-        )
+        title = page.title
         
-        if title_tag:
-            if title_tag.name == 'meta':
-                title = title_tag.get('content', '')
-            else:
-                title = title_tag.get_text(strip=True)
-            
-            title = Patterns.FANZA_PREFIX.sub('', title).strip()
-            title = re.sub(r'\s*[-|｜].*(?:DMM|FANZA).*$', '', title).strip()
-            
-            if title:
-                logger.info(f"[FANZA] 成功获取 {gid}: {title[:30]}")
-                return SearchResult(
-                    source=SearchSource.FANZA,
-                    id=gid,
-                    title=title,
-                    url=url,
-                    from_vndb=True
-                )
+        if title:
+            logger.info(f"[FANZA] 成功获取 {gid}: {title[:30]}")
+            return SearchResult(
+                source=SearchSource.FANZA,
+                id=gid,
+                title=title,
+                url=url,
+                from_vndb=True,
+                cover_url=page.image_url or fanza_cover_url(gid)
+            )
         
         logger.warning(f"[FANZA] {gid} 无法解析标题")
         return SearchResult(
@@ -1208,14 +3185,24 @@ def fetch_fanza_info_by_id(gid: str) -> Optional[SearchResult]:
             id=gid,
             title=gid,
             url=url,
-            from_vndb=True
+            from_vndb=True,
+            cover_url=page.image_url or fanza_cover_url(gid)
         )
         
+    except RequestCancelled:
+        logger.debug(f"[FANZA] 获取 {gid} 已取消")
     except Exception as e:
         logger.warning(f"[FANZA] 获取 {gid} 信息失败: {e}")
+        if isinstance(e, requests.RequestException):
+            breaker.record_failure()
     return None
 
 
+def fetch_fanza_info_by_id(gid: str, token: Optional[CancelToken] = None) -> Optional[SearchResult]:
+    """同步外观 - 通过 ID 获取 FANZA 游戏信息"""
+    return async_engine.run(afetch_fanza_info_by_id(gid), token=token)
+
+
 # ============================================================================
 # 搜索实现
 # ============================================================================
@@ -1228,16 +3215,18 @@ class VNDBSearchProvider(ISearchProvider):
         return SearchSource.VNDB
     
     @safe_search(SearchSource.VNDB)
-    def search(self, keyword: str) -> List[SearchResult]:
+    async def asearch(self, keyword: str) -> List[SearchResult]:
         results = []
         
         payload = {
             "filters": ["search", "=", keyword],
-            "fields": "id, title, titles.title, titles.lang, image.url",
+            "fields": "id, title, titles.title, titles.lang, image.url, image.thumbnail, extlinks.url",
             "results": Limits.MAX_RESULTS
         }
         
-        resp = network.post(APIEndpoints.VNDB_API, headers=Headers.VNDB, json=payload)
+        resp = await network.apost(
+            APIEndpoints.VNDB_API, headers=Headers.VNDB, json=payload, idempotent=True
+        )
         data = resp.json()
         
         for item in data.get('results', []):
@@ -1249,19 +3238,64 @@ class VNDBSearchProvider(ISearchProvider):
                     final_title = t_obj['title']
                     break
             
-            img_obj = item.get('image')
-            thumb_url = img_obj.get('url', '') if img_obj else ""
+            img_obj = item.get('image') or {}
             
             results.append(SearchResult(
                 source=SearchSource.VNDB,
                 id=gid,
                 title=final_title,
                 url=f"https://vndb.org/{gid}",
-                thumb_url=thumb_url
+                thumb_url=img_obj.get('thumbnail', ''),
+                cover_url=img_obj.get('url', ''),
+                shop_links=self._shop_links(item.get('extlinks', []))
             ))
         
+        # 商店链接挂在发行版上，VN 本身没有的统一用一次发行版查询补齐
+        missing = [r for r in results if not r.shop_links]
+        if missing:
+            await self._fill_release_links(missing)
+        
         logger.info(f"[VNDB] 找到 {len(results)} 个结果")
         return results
+    
+    @staticmethod
+    def _shop_links(extlinks: List[Dict[str, Any]]) -> List[str]:
+        """筛选 DLsite/DMM 外链"""
+        links = []
+        for link in extlinks or []:
+            url = link.get('url', '')
+            if 'dlsite.com' in url or 'dmm.co.jp' in url:
+                links.append(url)
+        return links
+    
+    async def _fill_release_links(self, results: List[SearchResult]) -> None:
+        """批量查询发行版外链并回填到对应 VN"""
+        by_id = {r.id: r for r in results}
+        vn_filters = [["vn", "=", ["id", "=", gid]] for gid in by_id]
+        
+        payload = {
+            "filters": vn_filters[0] if len(vn_filters) == 1 else ["or", *vn_filters],
+            "fields": "vns.id, extlinks.url",
+            "results": 100
+        }
+        
+        try:
+            resp = await network.apost(
+                APIEndpoints.VNDB_RELEASE_API, headers=Headers.VNDB, json=payload, idempotent=True
+            )
+            data = resp.json()
+        except Exception as e:
+            logger.warning(f"[VNDB] 发行版外链查询失败: {e}")
+            return
+        
+        for release in data.get('results', []):
+            links = self._shop_links(release.get('extlinks', []))
+            if not links:
+                continue
+            for vn in release.get('vns', []):
+                result = by_id.get(vn.get('id'))
+                if result:
+                    result.shop_links.extend(l for l in links if l not in result.shop_links)
 
 
 class DLsiteSearchProvider(ISearchProvider):
@@ -1281,14 +3315,14 @@ class DLsiteSearchProvider(ISearchProvider):
         return SearchSource.DLSITE
     
     @safe_search(SearchSource.DLSITE)
-    def search(self, keyword: str) -> List[SearchResult]:
+    async def asearch(self, keyword: str) -> List[SearchResult]:
         self._current_keyword = keyword
         clean_keyword = keyword.strip()
         
         # ===== 1. 精确 ID 检测 =====
         if Patterns.DLSITE_ID.match(clean_keyword.upper()):
             gid = clean_keyword.upper()
-            result = fetch_dlsite_info_by_id(gid)
+            result = await afetch_dlsite_info_by_id(gid)
             if result:
                 result.from_vndb = False  # 直接ID搜索不是VNDB嗅探
                 logger.info(f"[DLsite] 精确匹配ID: {gid}")
@@ -1298,28 +3332,8 @@ class DLsiteSearchProvider(ISearchProvider):
         # ===== 2. 生成搜索候选词 =====
         search_candidates = self._generate_search_candidates(clean_keyword)
         
-        # ===== 3. 渐进式搜索 =====
-        results: List[SearchResult] = []
-        seen_ids: Set[str] = set()
-        tried_keywords: Set[str] = set()
-        
-        for candidate in search_candidates:
-            if len(results) >= Limits.MAX_RESULTS * 2:
-                break
-            
-            if candidate in tried_keywords or len(candidate) < 2:
-                continue
-            tried_keywords.add(candidate)
-            
-            new_results = self._search_keyword(candidate, seen_ids)
-            
-            if new_results:
-                results.extend(new_results)
-                logger.info(f"[DLsite] 「{candidate[:20]}」找到 {len(new_results)} 个")
-                
-                # 完整标题搜到足够结果就停止
-                if len(results) >= Limits.MAX_RESULTS and candidate == search_candidates[0]:
-                    break
+        # ===== 3. 并发候选词搜索 =====
+        results = await self._run_candidates(search_candidates)
         
         # ===== 4. 相关性排序 =====
         if results:
@@ -1408,42 +3422,189 @@ class DLsiteSearchProvider(ISearchProvider):
                     cores.append(cleaned)
         return cores
     
-    def _search_keyword(self, keyword: str, seen_ids: Set[str]) -> List[SearchResult]:
-        """执行单个关键词的搜索"""
+    async def _run_candidates(self, search_candidates: List[str]) -> List[SearchResult]:
+        """并发执行候选词搜索，按优先级顺序合并，满足停止条件后取消剩余候选"""
+        candidates: List[str] = []
+        for candidate in search_candidates:
+            if candidate not in candidates and len(candidate) >= 2:
+                candidates.append(candidate)
+        
+        if not candidates:
+            return []
+        
+        # 信号量按先来先服务放行，高优先级候选词先发出请求
+        semaphore = asyncio.Semaphore(Limits.DLSITE_MAX_IN_FLIGHT)
+        tasks = [
+            asyncio.ensure_future(self._search_keyword(candidate, semaphore))
+            for candidate in candidates
+        ]
+        
+        results: List[SearchResult] = []
+        seen_ids: Set[str] = set()
+        
+        try:
+            for candidate, task in zip(candidates, tasks):
+                CancelToken.check()
+                if len(results) >= Limits.MAX_RESULTS * 2:
+                    break
+                
+                try:
+                    listings = await task
+                except requests.RequestException as e:
+                    # 已有结果时不因后续候选失败丢弃；一个结果都没有说明 DLsite 不可用
+                    if not results:
+                        raise
+                    logger.warning(f"[DLsite] 「{candidate[:20]}」失败，停止后续候选: {e}")
+                    break
+                
+                new_results = self._merge_listings(listings, seen_ids)
+                
+                if new_results:
+                    results.extend(new_results)
+                    logger.info(f"[DLsite] 「{candidate[:20]}」找到 {len(new_results)} 个")
+                    
+                    # 完整标题搜到足够结果就停止
+                    if len(results) >= Limits.MAX_RESULTS and candidate == search_candidates[0]:
+                        break
+        finally:
+            cancelled = sum(1 for task in tasks if task.cancel())
+            if cancelled:
+                logger.debug(f"[DLsite] 已取消 {cancelled} 个低优先级候选")
+        
+        return results
+    
+    @staticmethod
+    def _merge_listings(
+        listings: List[List[DLsiteListing]],
+        seen_ids: Set[str]
+    ) -> List[SearchResult]:
+        """按模式顺序合并单个候选词的搜索结果"""
         results = []
         
-        for mode in APIEndpoints.DLSITE_MODES:
+        for listing in listings:
             if len(results) >= 5:
                 break
             
-            try:
-                url = APIEndpoints.dlsite_search(mode, keyword)
-                resp = network.get(url, cookies=Cookies.DLSITE)
+            for item in listing:
+                if item.id in seen_ids:
+                    continue
                 
-                for link, gid in Patterns.DLSITE_LINK.findall(resp.text):
-                    if gid in seen_ids:
-                        continue
-                    
-                    title_match = re.search(
-                        f'product_id/{gid}.*?title="(.*?)"',
-                        resp.text,
-                        re.S
-                    )
-                    title = title_match.group(1).replace('"', '').strip() if title_match else gid
-                    
-                    results.append(SearchResult(
-                        source=SearchSource.DLSITE,
-                        id=gid,
-                        title=title,
-                        url=link
-                    ))
-                    seen_ids.add(gid)
-                    
+                results.append(SearchResult(
+                    source=SearchSource.DLSITE,
+                    id=item.id,
+                    title=item.title,
+                    url=item.url,
+                    thumb_url=item.thumb_url,
+                    circle=item.circle,
+                    price=item.price,
+                    cover_url=dlsite_cover_url(item.id, item.thumb_url)
+                ))
+                seen_ids.add(item.id)
+        
+        return results
+    
+    async def _search_keyword(
+        self,
+        keyword: str,
+        semaphore: asyncio.Semaphore
+    ) -> List[List[DLsiteListing]]:
+        """执行单个关键词的搜索，各模式并发请求
+        
+        所有模式都遇到网络错误时抛出，交由 safe_search 计入熔断；部分失败只记日志
+        """
+        async def fetch_mode(mode: str) -> List[DLsiteListing]:
+            try:
+                async with semaphore:
+                    # 排队期间搜索可能已被取消，剩余候选不再发请求
+                    CancelToken.check()
+                    url = APIEndpoints.dlsite_search(mode, keyword)
+                    resp = await network.aget(url, hedge=True, cookies=Cookies.DLSITE)
+                # 错误页不能当作空列表
+                resp.raise_for_status()
+                return await async_engine.run_blocking(self._parse_listing, resp.text)
+            except RequestCancelled:
+                return []
+            except requests.RequestException:
+                raise
             except Exception as e:
-                logger.warning(f"[DLsite] 搜索「{keyword[:15]}」失败: {e}")
+                logger.warning(f"[DLsite] 解析「{keyword[:15]}」失败: {e}")
+                return []
+        
+        outcomes = await asyncio.gather(
+            *(fetch_mode(mode) for mode in APIEndpoints.DLSITE_MODES),
+            return_exceptions=True
+        )
+        errors = [o for o in outcomes if isinstance(o, BaseException)]
+        for error in errors:
+            if not isinstance(error, requests.RequestException):
+                raise error
+        if errors and len(errors) == len(outcomes):
+            raise errors[0]
+        for error in errors:
+            logger.warning(f"[DLsite] 搜索「{keyword[:15]}」失败: {error}")
+        return [[] if isinstance(o, BaseException) else o for o in outcomes]
+    
+    @staticmethod
+    def _parse_listing(text: str) -> List[DLsiteListing]:
+        """单遍解析搜索结果页
+        
+        先一次性找出所有作品链接的位置，某作品的区块从它首个链接所在标签开始，
+        到下一个作品的首个链接为止；字段只在各自区块内查找，整页只扫描一遍。
+        """
+        starts: List[Tuple[int, str, str]] = []
+        page_seen: Set[str] = set()
+        
+        for match in Patterns.DLSITE_LINK.finditer(text):
+            link, gid = match.groups()
+            if gid in page_seen:
                 continue
+            page_seen.add(gid)
+            # 从标签开头算起，title 属性写在 href 前面也能取到
+            starts.append((max(0, text.rfind('<', 0, match.start())), link, gid))
         
-        return results
+        # 最后一个作品的区块止于结果列表容器的闭合处，不延伸到页脚、排行榜
+        last_end = DLsiteSearchProvider._result_list_end(text, starts[-1][0]) if starts else len(text)
+        
+        listing = []
+        for i, (start, link, gid) in enumerate(starts):
+            end = starts[i + 1][0] if i + 1 < len(starts) else last_end
+            
+            title_match = Patterns.DLSITE_ITEM_TITLE.search(text, start, end)
+            thumb_match = Patterns.DLSITE_ITEM_THUMB.search(text, start, end)
+            circle_match = Patterns.DLSITE_ITEM_CIRCLE.search(text, start, end)
+            price_match = Patterns.DLSITE_ITEM_PRICE.search(text, start, end)
+            
+            title = html.unescape(title_match.group(1)).strip() if title_match else ""
+            
+            listing.append(DLsiteListing(
+                id=gid,
+                url=link,
+                title=title or gid,
+                thumb_url=_absolute_url(thumb_match.group(1)) if thumb_match else "",
+                circle=html.unescape(circle_match.group(1)).strip() if circle_match else "",
+                price=int(price_match.group(1).replace(',', '')) if price_match else None
+            ))
+        
+        return listing
+    
+    @staticmethod
+    def _result_list_end(text: str, last_start: int) -> int:
+        """结果列表容器闭合标签的位置；找不到容器时退回页尾"""
+        container = None
+        for match in Patterns.DLSITE_RESULT_LIST.finditer(text, 0, last_start):
+            container = match
+        if container is None:
+            return len(text)
+        
+        # 同名标签按嵌套深度配对
+        tag = container.group(1)
+        tags = re.compile(rf'<(/?){tag}\b[^>]*>', re.IGNORECASE)
+        depth = 1
+        for match in tags.finditer(text, container.end()):
+            depth += -1 if match.group(1) else 1
+            if depth == 0:
+                return match.start() if match.start() > last_start else len(text)
+        return len(text)
 
 
 class FanzaSearchProvider(ISearchProvider):
@@ -1457,13 +3618,13 @@ class FanzaSearchProvider(ISearchProvider):
         return SearchSource.FANZA
     
     @safe_search(SearchSource.FANZA)
-    def search(self, keyword: str) -> List[SearchResult]:
+    async def asearch(self, keyword: str) -> List[SearchResult]:
         self._current_keyword = keyword
         clean_keyword = keyword.strip()
         
         # 精确 ID 检测
         if Patterns.FANZA_ID_EXACT.match(clean_keyword.lower()):
-            result = fetch_fanza_info_by_id(clean_keyword.lower())
+            result = await afetch_fanza_info_by_id(clean_keyword.lower())
             if result:
                 result.from_vndb = False
                 logger.info(f"[FANZA] 精确匹配ID: {clean_keyword}")
@@ -1471,7 +3632,7 @@ class FanzaSearchProvider(ISearchProvider):
             logger.warning(f"[FANZA] ID {clean_keyword} 未找到，尝试搜索")
         
         # 执行搜索
-        results = self._do_search(keyword)
+        results = await self._do_search(keyword)
         
         # 相关性排序
         if results:
@@ -1484,20 +3645,27 @@ class FanzaSearchProvider(ISearchProvider):
         
         return results[:Limits.MAX_RESULTS]
     
-    def _do_search(self, keyword: str) -> List[SearchResult]:
+    async def _do_search(self, keyword: str) -> List[SearchResult]:
         """执行搜索"""
-        results: List[SearchResult] = []
-        
         url = APIEndpoints.fanza_search(keyword)
-        resp = network.get(url, cookies=Cookies.FANZA)
+        resp = await network.aget(url, hedge=True, cookies=Cookies.FANZA)
+        # 错误页不能当作空列表，抛出后由熔断器记为失败
+        resp.raise_for_status()
         
-        soup = BeautifulSoup(resp.content, 'html.parser')
+        results = await async_engine.run_blocking(self._parse_results, resp.content)
+        logger.info(f"[FANZA] 原始找到 {len(results)} 个结果")
+        return results
+    
+    def _parse_results(self, content: bytes) -> List[SearchResult]:
+        """解析搜索结果页"""
+        results: List[SearchResult] = []
         
-        items = soup.select('li.tmb-list-item, div.t-item')
+        items = parse_html(content, Strainers.FANZA_ITEMS).select('li.tmb-list-item, div.t-item')
         if items:
             links = [item.find('a', href=Patterns.FANZA_ID) for item in items]
         else:
-            links = soup.find_all('a', href=Patterns.FANZA_ID)
+            # 页面结构变化时退回扫描全部链接（保留 img 供取缩略图）
+            links = parse_html(content, Strainers.FANZA_LINKS).find_all('a', href=Patterns.FANZA_ID)
         
         seen: Set[str] = set()
         
@@ -1527,14 +3695,14 @@ class FanzaSearchProvider(ISearchProvider):
                 id=gid,
                 title=title,
                 url=APIEndpoints.fanza_detail(gid),
-                thumb_url=thumb
+                thumb_url=thumb,
+                cover_url=fanza_cover_url(gid, thumb)
             ))
             seen.add(gid)
             
             if len(results) >= Limits.MAX_RESULTS * 2:
                 break
         
-        logger.info(f"[FANZA] 原始找到 {len(results)} 个结果")
         return results
 
 
@@ -1542,78 +3710,228 @@ class FanzaSearchProvider(ISearchProvider):
 # VNDB 嗅探
 # ============================================================================
 
-def sniff_shop_ids_from_vndb(vndb_results: List[SearchResult]) -> SniffedShopInfo:
-    """从 VNDB 结果页面嗅探所有商店 ID"""
+def _extract_shop_links(content: bytes) -> List[str]:
+    """提取 VNDB 页面中的 DLsite/DMM 链接"""
+    soup = parse_html(content, Strainers.ANCHORS)
+    return [
+        anchor['href'] for anchor in soup.find_all('a', href=True)
+        if 'dlsite.com' in anchor['href'] or 'dmm.co.jp' in anchor['href']
+    ]
+
+
+async def asniff_shop_ids_from_vndb(vndb_results: List[SearchResult]) -> SniffedShopInfo:
+    """从 VNDB 结果嗅探所有商店 ID（优先使用 API 外链，无外链时才抓取页面）"""
     sniffed = SniffedShopInfo()
     dlsite_seen: Set[str] = set()
     fanza_seen: Set[str] = set()
     
-    for result in vndb_results:
+    async def fetch_links(result: SearchResult) -> List[str]:
+        if result.shop_links:
+            return result.shop_links
         try:
-            resp = network.get(result.url)
-            soup = BeautifulSoup(resp.content, 'html.parser')
-            
-            for anchor in soup.find_all('a', href=True):
-                href = anchor['href']
-                
-                if 'dlsite.com' in href:
-                    for match in Patterns.VNDB_SNIFF_DLSITE.finditer(href):
-                        gid = match.group(1).upper()
-                        if gid not in dlsite_seen:
-                            sniffed.dlsite_ids.append(gid)
-                            dlsite_seen.add(gid)
-                
-                elif 'dmm.co.jp' in href and '/detail/' in href:
-                    match = Patterns.VNDB_SNIFF_DMM.search(href)
-                    if match:
-                        gid = match.group(1)
-                        if gid not in fanza_seen and not Patterns.is_non_game_id(gid):
-                            sniffed.fanza_ids.append(gid)
-                            fanza_seen.add(gid)
-        
+            resp = await network.aget(result.url)
+            return await async_engine.run_blocking(_extract_shop_links, resp.content)
         except Exception as e:
             logger.warning(f"[VNDB嗅探] 解析 {result.id} 失败: {e}")
+            return []
+    
+    scraped = sum(1 for r in vndb_results if not r.shop_links)
+    if scraped:
+        logger.debug(f"[VNDB嗅探] {scraped} 个结果无 API 外链，回退页面解析")
+    
+    # 并发抓取，按原结果顺序合并以保持 ID 顺序稳定
+    all_links = await asyncio.gather(*(fetch_links(r) for r in vndb_results))
+    CancelToken.check()
+    
+    for links in all_links:
+        for href in links:
+            if 'dlsite.com' in href:
+                for match in Patterns.VNDB_SNIFF_DLSITE.finditer(href):
+                    gid = match.group(1).upper()
+                    if gid not in dlsite_seen:
+                        sniffed.dlsite_ids.append(gid)
+                        dlsite_seen.add(gid)
+            
+            elif 'dmm.co.jp' in href and '/detail/' in href:
+                match = Patterns.VNDB_SNIFF_DMM.search(href)
+                if match:
+                    gid = match.group(1)
+                    if gid not in fanza_seen and not Patterns.is_non_game_id(gid):
+                        sniffed.fanza_ids.append(gid)
+                        fanza_seen.add(gid)
     
     logger.info(f"[VNDB嗅探] DLsite: {len(sniffed.dlsite_ids)}个, FANZA: {len(sniffed.fanza_ids)}个")
     return sniffed
 
 
+def sniff_shop_ids_from_vndb(
+    vndb_results: List[SearchResult],
+    token: Optional[CancelToken] = None
+) -> SniffedShopInfo:
+    """同步外观 - 从 VNDB 结果页面嗅探所有商店 ID"""
+    return async_engine.run(asniff_shop_ids_from_vndb(vndb_results), token=token)
+
+
 # ============================================================================
 # 可取消的图片加载器
 # ============================================================================
 
 class CancellableImageLoader:
-    """可取消的图片加载器"""
+    """可取消的图片加载器 - 有界并发、新请求取代旧请求
     
-    def __init__(self):
+    被取代的加载连同其下载一起中止（无人等待的下载由令牌在数据块之间打断），
+    尚未开始的解码直接跳过；回调只交付 PIL 图像，PhotoImage 由调用方在 Tk 线程创建。
+    给出 on_preview 时先交付小图，同一次加载的大图随后经 on_success 替换。
+    """
+    
+    def __init__(self, max_concurrent: int = Limits.COVER_LOADERS):
+        self._max_concurrent = max_concurrent
+        self._slots: Optional[asyncio.Semaphore] = None
         self._current_task_id: int = 0
+        self._current_future: Optional[Future] = None
+        self._current_token: Optional[CancelToken] = None
         self._lock = threading.Lock()
     
+    async def _run(
+        self,
+        token: CancelToken,
+        result: SearchResult,
+        image_fetcher: Callable[[SearchResult], Awaitable[Optional[Any]]]
+    ) -> Optional[Any]:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._max_concurrent)
+        async with self._slots:
+            # 排队期间已被取代的直接放弃
+            token.raise_if_cancelled()
+            with token.scope():
+                return await image_fetcher(result)
+    
     def load(
         self,
         result: SearchResult,
         on_success: Callable[[Any], None],
         on_error: Callable[[], None],
-        image_fetcher: Callable[[SearchResult], Optional[Any]]
+        image_fetcher: Callable[..., Awaitable[Optional[Any]]],
+        on_preview: Optional[Callable[[Any], None]] = None
     ) -> None:
+        token = shutdown_token.child()
+        
+        def preview(image: Any) -> None:
+            with self._lock:
+                if task_id == self._current_task_id and not token.cancelled:
+                    on_preview(image)
+        
+        fetch = image_fetcher
+        if on_preview is not None:
+            fetch = lambda r: image_fetcher(r, on_preview=preview)  # noqa: E731
+        
         with self._lock:
+            self._cancel_locked()
             self._current_task_id += 1
             task_id = self._current_task_id
+            future = async_engine.submit(self._run(token, result, fetch))
+            self._current_future = future
+            self._current_token = token
         
-        def worker():
-            tk_img = image_fetcher(result)
+        def on_done(f: Future):
+            if f.cancelled() or token.cancelled:
+                return
+            try:
+                image = f.result()
+            except RequestCancelled:
+                return
+            except Exception as e:
+                logger.warning(f"图片加载失败: {e}")
+                image = None
             with self._lock:
                 if task_id == self._current_task_id:
-                    if tk_img:
-                        on_success(tk_img)
+                    if image:
+                        on_success(image)
                     else:
                         on_error()
         
-        threading.Thread(target=worker, daemon=True).start()
+        future.add_done_callback(on_done)
+    
+    def _cancel_locked(self) -> None:
+        if self._current_token:
+            self._current_token.cancel()
+            self._current_token = None
+        if self._current_future:
+            self._current_future.cancel()
+            self._current_future = None
     
     def cancel_current(self) -> None:
         with self._lock:
             self._current_task_id += 1
+            self._cancel_locked()
+    
+    @property
+    def busy(self) -> bool:
+        """交互加载是否正在进行"""
+        future = self._current_future
+        return future is not None and not future.done()
+
+
+class CoverPrefetcher:
+    """封面预取器 - 沿浏览方向提前下载并渲染接下来几项的封面
+    
+    一次只取一张，交互加载进行时让路，只占用空闲带宽；成品进入内存与磁盘封面缓存，
+    本批累计字节超出预算即停止，不把刚看过的封面挤出内存缓存。
+    新的预取计划或新的搜索取消上一批，进行中的下载随令牌一起中止。
+    """
+    
+    def __init__(
+        self,
+        loader: CancellableImageLoader,
+        count: int = Limits.PREFETCH_COVERS,
+        budget_bytes: int = Limits.PREFETCH_BUDGET_MB * 1024 * 1024
+    ):
+        self._loader = loader
+        self._count = count
+        self._budget_bytes = budget_bytes
+        self._future: Optional[Future] = None
+        self._token: Optional[CancelToken] = None
+        self._lock = threading.Lock()
+    
+    def schedule(self, candidates: List[SearchResult]) -> None:
+        """按给定顺序预取前若干项，取代上一批"""
+        with self._lock:
+            self._cancel_locked()
+            if not candidates:
+                return
+            token = shutdown_token.child()
+            self._token = token
+            self._future = async_engine.submit(self._run(token, candidates[:self._count]))
+    
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancel_locked()
+    
+    def _cancel_locked(self) -> None:
+        if self._token:
+            self._token.cancel()
+            self._token = None
+        if self._future:
+            self._future.cancel()
+            self._future = None
+    
+    async def _run(self, token: CancelToken, results: List[SearchResult]) -> None:
+        spent = 0
+        with token.scope(), Priority.BACKGROUND.scope():
+            try:
+                for result in results:
+                    # 交互加载优先：等它结束（及短暂的稳定期）再取下一张
+                    await asyncio.sleep(Timeouts.PREFETCH_DELAY)
+                    while self._loader.busy:
+                        await asyncio.sleep(Timeouts.PREFETCH_DELAY)
+                    token.raise_if_cancelled()
+                    
+                    spent += await search_service.aprefetch_cover(result)
+                    if spent >= self._budget_bytes:
+                        logger.debug(f"[预取] 已达预算 {spent // 1024}KB，停止")
+                        break
+            except RequestCancelled:
+                pass
 
 
 # ============================================================================
@@ -1781,69 +4099,176 @@ class SearchService:
             FanzaSearchProvider(),
             VNDBSearchProvider(),
         ]
-        self.image_cache = ImageCache(Limits.IMAGE_CACHE_SIZE)
+        self.image_cache = ImageCache(Limits.IMAGE_CACHE_MAX_MB * 1024 * 1024)
+        # PhotoImage 持有解码后的像素，只给屏幕上的封面和少量前后保留
+        self._photos = LRUCache(Limits.PHOTO_CACHE_SIZE)
         self._search_cache = LRUCache(Limits.SEARCH_CACHE_SIZE)
-        self._executor = ThreadPoolExecutor(max_workers=Limits.MAX_WORKERS)
         self._cache_lock = threading.Lock()
     
-    def shutdown(self) -> None:
-        self._executor.shutdown(wait=False)
-        logger.info("搜索服务线程池已关闭")
-    
     def search_all(self, keyword: str, use_cache: bool = True) -> GroupedResults:
+        """同步外观 - 阻塞等待全部搜索完成"""
+        return async_engine.run(self.asearch_all(keyword, use_cache))
+    
+    def iter_search(
+        self,
+        keyword: str,
+        use_cache: bool = True,
+        token: Optional[CancelToken] = None
+    ) -> Iterator[SearchUpdate]:
+        """同步外观 - 逐个产出渐进式搜索更新；令牌取消时整个搜索（含嗅探）随之取消"""
+        updates: queue.Queue = queue.Queue()
+        done = object()
+        
+        async def pump():
+            try:
+                async for update in self.astream_search(keyword, use_cache):
+                    updates.put(update)
+            except asyncio.CancelledError:
+                logger.info(f"搜索已被取代: {keyword}")
+                raise
+            except Exception as e:
+                logger.error(f"渐进式搜索失败: {e}")
+            finally:
+                updates.put(done)
+        
+        async_engine.submit(pump(), token=token)
+        while True:
+            update = updates.get()
+            if update is done:
+                return
+            yield update
+    
+    async def asearch_all(self, keyword: str, use_cache: bool = True) -> GroupedResults:
+        grouped = GroupedResults()
+        async for update in self.astream_search(keyword, use_cache):
+            grouped = update.grouped
+        return grouped
+    
+    async def astream_search(self, keyword: str, use_cache: bool = True) -> AsyncIterator[SearchUpdate]:
+        """渐进式搜索 - 每个来源返回或每个嗅探条目到达时产出一次重排后的快照"""
         self.image_cache.cleanup_if_needed()
         
         # 检查缓存
         if use_cache:
             with self._cache_lock:
                 cached = self._search_cache.get(keyword)
-                if cached:
-                    logger.info(f"使用缓存结果: {keyword}")
-                    return cached
+            if cached:
+                logger.info(f"使用缓存结果: {keyword}")
+                yield SearchUpdate(cached, "cache", done=True)
+                return
         
         grouped = GroupedResults()
+        events: asyncio.Queue = asyncio.Queue()
+        deadline = Deadline.within_current(Timeouts.SEARCH_BUDGET)
         
-        # 并行搜索
-        futures = {
-            self._executor.submit(provider.search, keyword): provider.source
-            for provider in self.providers
-        }
-        
-        for future in as_completed(futures):
-            source = futures[future]
+        async def run_provider(provider: ISearchProvider) -> None:
             try:
-                response: SearchResponse = future.result()
-                if response.error:
-                    grouped.errors.append(f"{source.value}: {response.error}")
-                else:
-                    if source == SearchSource.DLSITE:
-                        grouped.dlsite = response.results
-                    elif source == SearchSource.FANZA:
-                        grouped.fanza = response.results
-                    elif source == SearchSource.VNDB:
-                        grouped.vndb = response.results
+                with deadline.scope():
+                    response = await provider.asearch(keyword)
             except Exception as e:
-                error_msg = f"{source.value}: {str(e)[:20]}"
-                grouped.errors.append(error_msg)
-                logger.error(f"搜索失败 - {error_msg}")
+                logger.error(f"搜索失败 - {provider.source.value}: {e}")
+                response = SearchResponse(error=str(e)[:20], source=provider.source)
+            await events.put(('provider', provider.source, response))
+        
+        # 并行搜索
+        tasks = [asyncio.ensure_future(run_provider(p)) for p in self.providers]
+        pending = len(tasks)
         
-        # VNDB 嗅探
-        if grouped.vndb:
-            self._integrate_vndb_sniffed_results(grouped, keyword)
+        try:
+            while pending:
+                kind, stage, payload = await events.get()
+                
+                if kind == 'provider':
+                    pending -= 1
+                    grouped.timings[stage.value] = payload.elapsed
+                    if payload.error:
+                        grouped.errors.append(f"{stage.value}: {payload.error}")
+                    else:
+                        self._merge_provider_results(grouped, stage, payload.results)
+                        # VNDB 一到就开始嗅探，不必等待其他来源
+                        if stage == SearchSource.VNDB and payload.results:
+                            tasks.append(asyncio.ensure_future(
+                                self._stream_vndb_sniffed_results(grouped, payload.results, events, deadline)
+                            ))
+                            pending += 1
+                    stage_name = stage.value
+                elif kind == 'sniffed':
+                    self._merge_sniffed_result(grouped, payload)
+                    stage_name = f"sniff:{payload.id}"
+                else:
+                    pending -= 1
+                    if pending:
+                        continue
+                    stage_name = "sniff"
+                
+                snapshot = ResultSorter.sort_grouped_results(keyword, grouped.copy())
+                yield SearchUpdate(snapshot, stage_name, done=pending == 0)
+        finally:
+            for task in tasks:
+                task.cancel()
         
         # 最终排序
-        grouped = ResultSorter.sort_grouped_results(keyword, grouped)
+        final = ResultSorter.sort_grouped_results(keyword, grouped.copy())
         
         # 缓存结果
         with self._cache_lock:
-            self._search_cache.set(keyword, grouped)
+            self._search_cache.set(keyword, final)
         
-        logger.info(f"搜索完成: 共 {grouped.total_count()} 个结果")
-        return grouped
+        logger.info(
+            f"搜索完成: 共 {final.total_count()} 个结果, "
+            f"用时 {deadline.elapsed:.2f}s / 预算 {deadline.budget}s"
+        )
+        logger.debug(f"[调度] {network.scheduler.stats}")
+    
+    @staticmethod
+    def _merge_provider_results(
+        grouped: GroupedResults,
+        source: SearchSource,
+        results: List[SearchResult]
+    ) -> None:
+        """合并来源结果，同 ID 的嗅探条目让位于直接搜索结果"""
+        ids = {r.id for r in results}
+        if source == SearchSource.DLSITE:
+            grouped.dlsite = results + [r for r in grouped.dlsite if r.id not in ids]
+        elif source == SearchSource.FANZA:
+            grouped.fanza = results + [r for r in grouped.fanza if r.id not in ids]
+        elif source == SearchSource.VNDB:
+            grouped.vndb = results
+    
+    @staticmethod
+    def _merge_sniffed_result(grouped: GroupedResults, result: SearchResult) -> None:
+        target = grouped.dlsite if result.source == SearchSource.DLSITE else grouped.fanza
+        if all(r.id != result.id for r in target):
+            target.append(result)
+    
+    async def _stream_vndb_sniffed_results(
+        self,
+        grouped: GroupedResults,
+        vndb_results: List[SearchResult],
+        events: asyncio.Queue,
+        deadline: Deadline
+    ) -> None:
+        """整合 VNDB 嗅探结果，每获取一个条目即推送一次"""
+        started = time.monotonic()
+        try:
+            with deadline.scope(), Priority.SNIFF.scope():
+                await self._sniff_and_fetch(grouped, vndb_results, events)
+        finally:
+            grouped.timings['sniff'] = time.monotonic() - started
+            logger.info(
+                f"[VNDB嗅探] 耗时 {grouped.timings['sniff']:.2f}s, "
+                f"搜索预算剩余 {deadline.remaining():.1f}s"
+            )
+            await events.put(('sniff_done', None, None))
     
-    def _integrate_vndb_sniffed_results(self, grouped: GroupedResults, keyword: str) -> None:
-        """整合 VNDB 嗅探结果"""
-        sniffed = sniff_shop_ids_from_vndb(grouped.vndb)
+    async def _sniff_and_fetch(
+        self,
+        grouped: GroupedResults,
+        vndb_results: List[SearchResult],
+        events: asyncio.Queue
+    ) -> None:
+        """嗅探商店 ID 并逐个获取条目信息"""
+        sniffed = await asniff_shop_ids_from_vndb(vndb_results)
         
         existing_dlsite_ids = {r.id for r in grouped.dlsite}
         existing_fanza_ids = {r.id for r in grouped.fanza}
@@ -1858,124 +4283,247 @@ class SearchService:
             if gid not in existing_fanza_ids:
                 tasks.append(('fanza', gid))
         
-        if not tasks:
-            return
-        
-        futures = {}
-        for platform, gid in tasks:
-            if platform == 'dlsite':
-                futures[self._executor.submit(fetch_dlsite_info_by_id, gid)] = ('dlsite', gid)
-            else:
-                futures[self._executor.submit(fetch_fanza_info_by_id, gid)] = ('fanza', gid)
-        
-        for future in as_completed(futures):
-            platform, gid = futures[future]
+        async def fetch(platform: str, gid: str) -> None:
             try:
-                result = future.result()
+                CancelToken.check()
+                if platform == 'dlsite':
+                    result = await afetch_dlsite_info_by_id(gid)
+                else:
+                    result = await afetch_fanza_info_by_id(gid)
                 if result:
-                    if platform == 'dlsite':
-                        grouped.dlsite.append(result)
-                    else:
-                        grouped.fanza.append(result)
+                    await events.put(('sniffed', platform, result))
+            except RequestCancelled:
+                pass
             except Exception as e:
                 logger.warning(f"[VNDB嗅探] 获取 {gid} 失败: {e}")
+        
+        await asyncio.gather(*(fetch(platform, gid) for platform, gid in tasks))
+    
+    def fetch_image(self, result: SearchResult, token: Optional[CancelToken] = None) -> Optional[CoverImage]:
+        """同步外观 - 获取封面图片"""
+        return async_engine.run(self.afetch_image(result), token=token)
     
-    def fetch_image(self, result: SearchResult) -> Optional[Any]:
+    async def afetch_image(
+        self,
+        result: SearchResult,
+        on_preview: Optional[Callable[[CoverImage], None]] = None
+    ) -> Optional[CoverImage]:
+        """获取封面；给出 on_preview 时先下载小图，大图尚未就绪就先交付放大的小图"""
+        deadline = Deadline.within_current(Timeouts.IMAGE_BUDGET)
+        with deadline.scope():
+            try:
+                preview_url = self._get_preview_url(result) if on_preview else None
+                if not preview_url or self._has_cover(self._get_image_url(result)):
+                    return await self._afetch_image(result)
+                return await self._afetch_progressive(result, preview_url, on_preview)
+            finally:
+                logger.debug(f"[封面] {result.id} 耗时 {deadline.elapsed:.2f}s / 预算 {deadline.budget}s")
+    
+    async def _afetch_progressive(
+        self,
+        result: SearchResult,
+        preview_url: str,
+        on_preview: Callable[[CoverImage], None]
+    ) -> Optional[CoverImage]:
+        # 大图与小图同时开始；大图命中缓存会先完成，此时小图直接取消（下载随之中止）
+        full = asyncio.ensure_future(self._afetch_image(result))
+        preview = asyncio.ensure_future(self._aload_cover(preview_url))
+        try:
+            done, _ = await asyncio.wait({full, preview}, return_when=asyncio.FIRST_COMPLETED)
+            if full not in done:
+                thumb = preview.result()
+                if thumb is not None:
+                    on_preview(thumb)
+            
+            cover = await full
+            if cover is None:
+                # 大图失败时小图总比没有强
+                cover = await preview
+            return cover
+        finally:
+            full.cancel()
+            preview.cancel()
+    
+    async def _afetch_image(self, result: SearchResult) -> Optional[CoverImage]:
         img_url = self._get_image_url(result)
+        cover = await self._aload_cover(img_url) if img_url else None
         
-        if not img_url:
-            return None
-        
-        cached = self.image_cache.get(img_url)
-        if cached:
-            return cached
+        if cover is None and result.source != SearchSource.VNDB:
+            # 规则推导的地址可能不存在（目录规则例外、作品下架等），退回解析作品页
+            page_url = await self._get_page_image_url(result)
+            if page_url and page_url != img_url:
+                cover = await self._aload_cover(page_url)
+                if cover is not None:
+                    result.cover_url = page_url
         
+        return cover
+    
+    async def _aload_cover(self, img_url: str) -> Optional[CoverImage]:
+        token = CancelToken.current()
         try:
-            resp = network.get(img_url, timeout=Timeouts.IMAGE)
-            pil_img = Image.open(io.BytesIO(resp.content))
-            
-            height = UISize.IMG_HEIGHT
-            width = int(pil_img.size[0] * (height / pil_img.size[1]))
-            pil_img = pil_img.resize((width, height), Image.Resampling.LANCZOS)
-            pil_img = self._add_corners(pil_img)
-            
-            tk_img = ImageTk.PhotoImage(pil_img)
-            self.image_cache.set(img_url, tk_img)
+            # 成品封面依次找内存、磁盘，都没有才下载并缩放
+            data = self.image_cache.get(img_url)
+            if data is None:
+                data = await async_engine.run_blocking(cover_cache.load, img_url)
+            if data is None:
+                resp = await network.aget(img_url, cache=False, kind="image")
+                if resp.status_code != 200:
+                    logger.info(f"封面不存在 ({resp.status_code}): {img_url[:80]}")
+                    return None
+                
+                # 已被取代的加载不再占用解码线程
+                if token is not None:
+                    token.raise_if_cancelled()
+                data = await async_engine.run_cpu(self._render_image, img_url, resp.content)
             
-            return tk_img
+            self.image_cache.set(img_url, data)
+            if token is not None:
+                token.raise_if_cancelled()
+            image = await async_engine.run_cpu(self._decode, data)
+            return CoverImage(url=img_url, image=image)
+        except RequestCancelled:
+            raise
         except Exception as e:
             logger.warning(f"图片加载失败: {e}")
             return None
     
-    def _get_image_url(self, result: SearchResult) -> Optional[str]:
+    async def aprefetch_cover(self, result: SearchResult) -> int:
+        """预取封面进缓存，返回新放入内存缓存的成品字节数（已缓存的为 0）"""
+        img_url = self._get_image_url(result)
+        if self._has_cover(img_url):
+            return 0
+        cover = await self.afetch_image(result)
+        if cover is None:
+            return 0
+        logger.debug(f"[预取] {result.id} 封面就绪")
+        return len(self.image_cache.get(cover.url) or b'')
+    
+    def _has_cover(self, img_url: Optional[str]) -> bool:
+        """成品大图已在内存或磁盘缓存中（只查索引，不读文件）"""
+        return bool(img_url) and (img_url in self.image_cache or img_url in cover_cache)
+    
+    @staticmethod
+    def _decode(data: bytes) -> Image.Image:
+        image = Image.open(io.BytesIO(data))
+        image.load()
+        return image
+    
+    def photo_for(self, cover: CoverImage) -> Any:
+        """把封面转成 PhotoImage（仅限 Tk 线程调用）"""
+        photo = self._photos.get(cover.url)
+        if photo is None:
+            photo = ImageTk.PhotoImage(cover.image)
+            self._photos.set(cover.url, photo)
+        return photo
+    
+    def _render_image(self, img_url: str, content: bytes) -> bytes:
+        """解码、缩放并加圆角，编码后的成品写入磁盘缓存"""
+        pil_img = render_cover(content)
+        data = cover_cache.encode(pil_img)
+        cover_cache.store(img_url, data)
+        return data
+    
+    @staticmethod
+    def _get_image_url(result: SearchResult) -> Optional[str]:
+        """封面地址：优先用搜索时记录的，其次按站点规则由 ID 推导，不需要抓页面"""
+        if result.cover_url:
+            return result.cover_url
+        if result.source == SearchSource.DLSITE:
+            return dlsite_cover_url(result.id, result.thumb_url) or None
+        if result.source == SearchSource.FANZA:
+            return fanza_cover_url(result.id, result.thumb_url)
+        return result.thumb_url or None
+    
+    @staticmethod
+    def _get_preview_url(result: SearchResult) -> Optional[str]:
+        """渐进显示用的小图地址；与大图相同（没有更小的版本）时返回 None"""
+        if result.source == SearchSource.DLSITE:
+            url = dlsite_thumb_url(result.id, result.thumb_url)
+        elif result.source == SearchSource.FANZA:
+            url = fanza_thumb_url(result.id, result.thumb_url)
+        else:
+            url = result.thumb_url
+        return url if url and url != SearchService._get_image_url(result) else None
+    
+    @staticmethod
+    async def _get_page_image_url(result: SearchResult) -> Optional[str]:
+        """从作品页解析封面地址（规则地址失效时的后备）"""
         try:
             if result.source == SearchSource.DLSITE:
-                resp = network.get(result.url, cookies=Cookies.DLSITE)
-                match = Patterns.OG_IMAGE.search(resp.text)
-                if match:
-                    raw = match.group(1).strip()
-                    return ("https:" + raw) if raw.startswith("//") else raw
+                page = await aload_dlsite_page(result.url, result.id, need_title=False)
+                if page and page.image_url:
+                    return page.image_url
             
             elif result.source == SearchSource.FANZA:
-                thumb = result.thumb_url
-                if thumb and 'ps.jpg' in thumb:
-                    candidate = thumb.replace('ps.jpg', 'pl.jpg')
-                    return ('https:' + candidate) if candidate.startswith('//') else candidate
-                else:
-                    resp = network.get(result.url, cookies=Cookies.FANZA)
-                    soup = BeautifulSoup(resp.content, 'html.parser')
-                    target = soup.select_one('a[name="package-image"]') or soup.select_one('#package-src')
-                    if target:
-                        img_url = target.get('href') or target.get('src', '')
-                        return ('https:' + img_url) if img_url.startswith('//') else img_url
-            
-            elif result.source == SearchSource.VNDB:
-                return result.thumb_url or None
+                page = await aload_fanza_page(result.url)
+                if page and page.image_url:
+                    return page.image_url
         except Exception as e:
             logger.error(f"获取图片URL失败: {e}")
         return None
     
-    @staticmethod
-    def _add_corners(im: Image.Image, radius: int = None) -> Image.Image:
-        if radius is None:
-            radius = UISize.CORNER_RADIUS
-        
-        try:
-            circle = Image.new('L', (radius * 2, radius * 2), 0)
-            draw = ImageDraw.Draw(circle)
-            draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
-            
-            alpha = Image.new('L', im.size, 255)
-            width, height = im.size
-            
-            if im.mode != 'RGBA':
-                im = im.convert('RGBA')
-            
-            alpha.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-            alpha.paste(circle.crop((0, radius, radius, radius * 2)), (0, height - radius))
-            alpha.paste(circle.crop((radius, 0, radius * 2, radius)), (width - radius, 0))
-            alpha.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (width - radius, height - radius))
-            
-            im.putalpha(alpha)
-            return im
-        except Exception:
-            return im
-    
     def clear_cache(self) -> None:
         self.image_cache.clear()
+        self._photos.clear()
         with self._cache_lock:
             self._search_cache.clear()
+        http_cache.clear()
+        cover_cache.clear()
         logger.info("所有缓存已清空")
 
 
 search_service = SearchService()
-resource_manager.register(search_service.shutdown, "SearchService")
+resource_manager.register(async_engine.shutdown, "AsyncEngine")
+# 最后注册、最先执行：先让所有下载中止，再关闭引擎
+resource_manager.register(shutdown_token.cancel, "ShutdownToken")
 
 
 # ============================================================================
 # 图片工具
 # ============================================================================
 
+@lru_cache(maxsize=16)
+def corner_mask(size: Tuple[int, int], radius: int) -> Image.Image:
+    """圆角透明度蒙版，按 (尺寸, 半径) 记忆；封面高度固定，宽度种类很少"""
+    circle = Image.new('L', (radius * 2, radius * 2), 0)
+    ImageDraw.Draw(circle).ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+    
+    width, height = size
+    mask = Image.new('L', size, 255)
+    mask.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+    mask.paste(circle.crop((0, radius, radius, radius * 2)), (0, height - radius))
+    mask.paste(circle.crop((radius, 0, radius * 2, radius)), (width - radius, 0))
+    mask.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (width - radius, height - radius))
+    return mask
+
+
+def add_corners(im: Image.Image, radius: int) -> Image.Image:
+    """一次 putalpha 套上圆角蒙版（蒙版共享，只读）"""
+    try:
+        if im.mode != 'RGBA':
+            im = im.convert('RGBA')
+        im.putalpha(corner_mask(im.size, radius))
+        return im
+    except Exception:
+        return im
+
+
+def render_cover(content: bytes, height: int = UISize.IMG_HEIGHT) -> Image.Image:
+    """解码封面并缩放到显示高度、加圆角
+    
+    JPEG 先用 draft 让解码器直接按 1/2、1/4、1/8 缩小解码（不小于目标尺寸），
+    其他格式由 reducing_gap 先整数倍缩小，再做 LANCZOS 精缩放
+    """
+    pil_img = Image.open(io.BytesIO(content))
+    width = max(1, int(pil_img.size[0] * (height / pil_img.size[1])))
+    
+    if pil_img.format == 'JPEG':
+        pil_img.draft('RGB', (width, height))
+    pil_img = pil_img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+    
+    return add_corners(pil_img, UISize.CORNER_RADIUS)
+
+
 def create_placeholder_image(
     width: int = 530,
     height: int = 380,
@@ -2007,7 +4555,7 @@ def create_placeholder_image(
         draw.ellipse((cx - 60, cy + 5, cx - 40, cy + 20), fill=blush_color)
         draw.ellipse((cx + 40, cy + 5, cx + 60, cy + 20), fill=blush_color)
         
-        return ImageTk.PhotoImage(SearchService._add_corners(img))
+        return ImageTk.PhotoImage(add_corners(img, UISize.CORNER_RADIUS))
     except Exception as e:
         logger.error(f"创建占位图失败: {e}")
         return None
@@ -2213,6 +4761,8 @@ class EventHandlers:
         self.app = app
     
     def on_entry_focus_in(self, event: tk.Event) -> None:
+        # 用户可能要搜索了，空闲已久的连接提前重建
+        network.warm_up()
         if self.app.entry.get() == self.app.placeholder_text:
             self.app.entry.delete(0, "end")
             self.app.entry.config(
@@ -2285,8 +4835,11 @@ class ButterFetchApp(ttk.Window):
         self.placeholder_text: str = random.choice(KAOMOJI_LIST)
         self.is_placeholder_active: bool = True
         self._search_timer: Optional[str] = None
+        self._search_generation: int = 0
+        self._search_token: Optional[CancelToken] = None
         self._is_filtered: bool = False
         self._filtered_results: Optional[List[SearchResult]] = None
+        self._filter_label: Optional[str] = None
         
         # 日志视图状态
         self.is_log_view: bool = False
@@ -2300,6 +4853,8 @@ class ButterFetchApp(ttk.Window):
         self.animation_manager = AnimationManager(self)
         self.shortcut_manager = ShortcutManager(self)
         self.image_loader = CancellableImageLoader()
+        self.cover_prefetcher = CoverPrefetcher(self.image_loader)
+        self._nav_direction = 1
         self.event_handlers = EventHandlers(self)
         
         # 初始化 UI
@@ -2315,10 +4870,9 @@ class ButterFetchApp(ttk.Window):
         if self.is_pinned:
             self.attributes('-topmost', True)
         
-        # 注册状态观察者
-        self.state_manager.add_observer(self._on_state_change)
-        
         logger.info("ButterFetch 启动成功")
+        dns_cache.install()
+        network.warm_up()
         
         self.after(50, self._setup_icon)
     
@@ -2547,12 +5101,6 @@ class ButterFetchApp(ttk.Window):
         self.shortcut_manager.register('<Control-V>', '智能粘贴', self._smart_paste)
         self.shortcut_manager.register('<Escape>', '清空搜索框', self._clear_entry)
     
-    def _on_state_change(self, old_state: SearchState, new_state: SearchState) -> None:
-        if new_state == SearchState.SEARCHING:
-            self.btn_search.config(state="disabled")
-        else:
-            self.btn_search.config(state="normal")
-    
     def _on_close(self) -> None:
         self._stop_log_auto_refresh()
         self.animation_manager.cancel_all()
@@ -2726,8 +5274,12 @@ class ButterFetchApp(ttk.Window):
         if not keyword or keyword == self.placeholder_text:
             return
         
-        if self.state_manager.is_searching():
-            return
+        # 新查询取代进行中的搜索：旧搜索的请求、候选词与嗅探一并取消，迟到的更新按代号丢弃
+        if self._search_token:
+            self._search_token.cancel()
+        self._search_token = shutdown_token.child()
+        self._search_generation += 1
+        self.image_loader.cancel_current()
         
         if self.is_log_view:
             self._toggle_log_view()
@@ -2749,27 +5301,42 @@ class ButterFetchApp(ttk.Window):
         
         self._is_filtered = False
         self._filtered_results = None
+        self._filter_label = None
+        self.current_result = None
+        self.cover_prefetcher.cancel()
+        self._nav_direction = 1
         
         threading.Thread(
             target=self._search_thread,
-            args=(keyword,),
+            args=(keyword, self._search_generation, self._search_token),
             daemon=True
         ).start()
     
-    def _search_thread(self, keyword: str) -> None:
-        grouped = search_service.search_all(keyword)
-        self.after(0, lambda: self._update_results(grouped))
+    def _search_thread(self, keyword: str, generation: int, token: CancelToken) -> None:
+        for update in search_service.iter_search(keyword, token=token):
+            if token.cancelled:
+                break
+            self.after(0, lambda u=update: self._apply_search_update(generation, u))
+    
+    def _apply_search_update(self, generation: int, update: SearchUpdate) -> None:
+        if generation != self._search_generation:
+            return
+        self._update_results(update.grouped, final=update.done)
     
-    def _update_results(self, grouped: GroupedResults) -> None:
-        self.progress_bar.stop()
-        self.progress_bar.pack_forget()
+    def _update_results(self, grouped: GroupedResults, final: bool = True) -> None:
+        # 渐进式更新：结果为空的中间快照不打断加载状态
+        if grouped.is_empty() and not final:
+            return
         
-        self.img_container.config(text="")
+        if final:
+            self.progress_bar.stop()
+            self.progress_bar.pack_forget()
         
         self.grouped_results = grouped
         self.all_results = grouped.all()
         
         if grouped.is_empty():
+            self.img_container.config(text="")
             self.state_manager.state = SearchState.NO_RESULT
             self.combo['values'] = []
             self.combo.set(UIText.NO_RESULT)
@@ -2780,22 +5347,51 @@ class ButterFetchApp(ttk.Window):
                     foreground="orange"
                 )
             else:
-                self.lbl_tip.config(text=UIText.NOT_FOUND, foreground=Colors.SAKURA)
+                # 有来源被熔断跳过时，"没找到"并不确定，一并提示
+                degraded = Templates.format_degraded(degraded_sources())
+                self.lbl_tip.config(
+                    text=UIText.NOT_FOUND + degraded,
+                    foreground="orange" if degraded else Colors.SAKURA
+                )
             
             self._load_standby_image()
             self._toggle_detail_view(False)
             return
         
-        self.state_manager.state = SearchState.SUCCESS
+        if final:
+            self.state_manager.state = SearchState.SUCCESS
         
         self._build_group_buttons(grouped)
         
+        tip = Templates.format_found(grouped.total_count(), grouped.sniffed_count())
+        tip += Templates.format_degraded(degraded_sources())
         self.lbl_tip.config(
-            text=Templates.format_found(grouped.total_count(), grouped.sniffed_count()),
-            foreground="green"
+            text=tip if final else tip + UIText.STILL_SEARCHING,
+            foreground="green" if final else Colors.SKY
         )
         
-        self.combo['values'] = [self._format_combo_item(r) for r in self.all_results]
+        if self._is_filtered:
+            # 重新定位当前分组在新快照中的范围
+            for label_text, start_idx, count, _ in grouped.group_labels():
+                if label_text == self._filter_label:
+                    self._filtered_results = self.all_results[start_idx:start_idx + count]
+                    break
+            else:
+                self._is_filtered = False
+                self._filtered_results = None
+                self._filter_label = None
+        
+        current_list = self._filtered_results if self._is_filtered else self.all_results
+        self.combo['values'] = [self._format_combo_item(r) for r in current_list]
+        
+        # 保持用户正在查看的结果，重排后只移动下拉框选中位置
+        for idx, result in enumerate(current_list):
+            if result is self.current_result:
+                self.combo.current(idx)
+                if final:
+                    self._schedule_prefetch()
+                return
+        
         self.combo.current(0)
         self.event_handlers.on_combo_select(None)
     
@@ -2828,7 +5424,7 @@ class ButterFetchApp(ttk.Window):
                 self.group_button_frame,
                 text=f"{label_text} ({count})",
                 bootstyle=btn_style,
-                command=lambda s=start_idx, e=start_idx + count: self._filter_by_group(s, e)
+                command=lambda s=start_idx, e=start_idx + count, l=label_text: self._filter_by_group(s, e, l)
             )
             btn.pack(side=LEFT, padx=(0, 5))
         
@@ -2840,12 +5436,13 @@ class ButterFetchApp(ttk.Window):
         )
         btn_all.pack(side=LEFT, padx=(10, 0))
     
-    def _filter_by_group(self, start_idx: int, end_idx: int) -> None:
+    def _filter_by_group(self, start_idx: int, end_idx: int, label: Optional[str] = None) -> None:
         if not self.grouped_results:
             return
         
         self._filtered_results = self.all_results[start_idx:end_idx]
         self._is_filtered = True
+        self._filter_label = label
         
         self.combo['values'] = [
             self._format_combo_item(r) for r in self._filtered_results
@@ -2861,6 +5458,7 @@ class ButterFetchApp(ttk.Window):
         
         self._is_filtered = False
         self._filtered_results = None
+        self._filter_label = None
         
         self.combo['values'] = [
             self._format_combo_item(r) for r in self.all_results
@@ -2889,6 +5487,7 @@ class ButterFetchApp(ttk.Window):
         
         self.img_container.config(image='', text=UIText.LOADING)
         
+        # 小图与大图都经 after 排队，先到的小图不会覆盖后到的大图
         self.image_loader.load(
             result,
             on_success=lambda img: self.after(0, lambda: self._update_image(img)),
@@ -2896,10 +5495,13 @@ class ButterFetchApp(ttk.Window):
                 0,
                 lambda: self.img_container.config(text=UIText.IMAGE_FAILED, image='')
             ),
-            image_fetcher=search_service.fetch_image
+            image_fetcher=search_service.afetch_image,
+            on_preview=lambda img: self.after(0, lambda: self._update_image(img))
         )
+        self._schedule_prefetch()
     
-    def _update_image(self, tk_img: Any) -> None:
+    def _update_image(self, cover: CoverImage) -> None:
+        tk_img = search_service.photo_for(cover)
         self.img_container.config(image=tk_img, text="")
         self.img_container.image = tk_img
     
@@ -2930,9 +5532,32 @@ class ButterFetchApp(ttk.Window):
         
         idx = self.combo.current() + delta
         if 0 <= idx < len(current_list):
+            self._nav_direction = 1 if delta > 0 else -1
             self.combo.current(idx)
             self._display_result(current_list[idx])
     
+    def _schedule_prefetch(self) -> None:
+        """沿浏览方向预取当前结果之后的封面；搜索结束、结果稳定后才开始"""
+        if self.state_manager.is_searching() or not self.current_result:
+            return
+        
+        current_list = (
+            self._filtered_results
+            if self._is_filtered and self._filtered_results
+            else self.all_results
+        )
+        for idx, result in enumerate(current_list):
+            if result is self.current_result:
+                break
+        else:
+            return
+        
+        if self._nav_direction > 0:
+            candidates = current_list[idx + 1:]
+        else:
+            candidates = current_list[:idx][::-1]
+        self.cover_prefetcher.schedule(candidates)
+    
     def _open_url(self) -> None:
         if self.current_result:
             webbrowser.open(self.current_result.url)
@@ -0,0 +1,87 @@
+"""
+封面处理微基准 - 比较旧流程（全尺寸解码 + LANCZOS + 每次重建圆角）与 render_cover
+
+用法:
+    python benchmarks/bench_covers.py [封面图片 ...] [-n 次数]
+
+不给图片时生成一张与 FANZA pl.jpg 尺寸相近的合成 JPEG。
+"""
+
+import io
+import os
+import sys
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+import ButterFetch as bf  # noqa: E402
+
+
+def legacy_render(content: bytes) -> Image.Image:
+    """优化前的流程，作为对照"""
+    pil_img = Image.open(io.BytesIO(content))
+
+    height = bf.UISize.IMG_HEIGHT
+    width = int(pil_img.size[0] * (height / pil_img.size[1]))
+    pil_img = pil_img.resize((width, height), Image.Resampling.LANCZOS)
+
+    radius = bf.UISize.CORNER_RADIUS
+    circle = Image.new('L', (radius * 2, radius * 2), 0)
+    draw = ImageDraw.Draw(circle)
+    draw.ellipse((0, 0, radius * 2 - 1, radius * 2 - 1), fill=255)
+
+    alpha = Image.new('L', pil_img.size, 255)
+    width, height = pil_img.size
+
+    if pil_img.mode != 'RGBA':
+        pil_img = pil_img.convert('RGBA')
+
+    alpha.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+    alpha.paste(circle.crop((0, radius, radius, radius * 2)), (0, height - radius))
+    alpha.paste(circle.crop((radius, 0, radius * 2, radius)), (width - radius, 0))
+    alpha.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (width - radius, height - radius))
+
+    pil_img.putalpha(alpha)
+    return pil_img
+
+
+def synthetic_cover(size=(800, 1136)) -> bytes:
+    img = Image.new('RGB', size)
+    draw = ImageDraw.Draw(img)
+    for y in range(0, size[1], 8):
+        draw.line((0, y, size[0], size[1] - y), fill=(y % 256, (y * 3) % 256, 128), width=5)
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=90)
+    return buffer.getvalue()
+
+
+def best_ms(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("images", nargs="*", help="封面图片文件")
+    parser.add_argument("-n", "--number", type=int, default=20, help="每轮处理次数")
+    args = parser.parse_args()
+
+    samples = []
+    for path in args.images:
+        with open(path, "rb") as f:
+            samples.append((os.path.basename(path), f.read()))
+    if not samples:
+        samples.append(("synthetic 800x1136 JPEG", synthetic_cover()))
+
+    print(f"{'图片':<28}{'原尺寸':>12}{'旧流程(ms)':>12}{'新流程(ms)':>12}{'加速':>8}")
+    for name, content in samples:
+        size = Image.open(io.BytesIO(content)).size
+        before = best_ms(lambda: legacy_render(content), args.number)
+        after = best_ms(lambda: bf.render_cover(content), args.number)
+        print(f"{name[:26]:<28}{f'{size[0]}x{size[1]}':>12}{before:>12.2f}{after:>12.2f}{before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
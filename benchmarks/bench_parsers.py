@@ -0,0 +1,70 @@
+"""
+HTML 解析基准 - 比较各调用点 "整页 html.parser" 与 "按需子树 + 当前解析器" 的耗时
+
+用法:
+    python benchmarks/bench_parsers.py <页面目录> [-n 次数]
+
+页面目录中按调用点放置保存好的原始 HTML（浏览器"另存为"或 curl 均可），缺失的跳过:
+    dlsite_product.html   DLsite 作品页         -> _parse_dlsite_page
+    fanza_search.html     FANZA 搜索结果页      -> FanzaSearchProvider._parse_results
+    fanza_detail.html     FANZA 详情页          -> _parse_fanza_page
+    vndb_vn.html          VNDB 作品页           -> _extract_shop_links
+
+只测本地解析耗时（页面已在内存中），不含网络。流式读取提前中止节省的是线上字节：
+gzip/br 页面的 Content-Length 是压缩后大小，节省量要看 resp.raw.tell()，不能看解压后的长度。
+"""
+
+import os
+import sys
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import ButterFetch as bf  # noqa: E402
+
+
+CALL_SITES = [
+    ("dlsite_product.html", "DLsite 作品页", bf.Strainers.DLSITE_PAGE,
+     lambda content: bf._parse_dlsite_page(content, "")),
+    ("fanza_search.html", "FANZA 搜索页", bf.Strainers.FANZA_ITEMS,
+     lambda content: bf.FanzaSearchProvider()._parse_results(content)),
+    ("fanza_detail.html", "FANZA 详情页", bf.Strainers.FANZA_PAGE,
+     bf._parse_fanza_page),
+    ("vndb_vn.html", "VNDB 作品页", bf.Strainers.ANCHORS,
+     bf._extract_shop_links),
+]
+
+
+def best_ms(func, number: int) -> float:
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pages", help="保存的页面目录")
+    parser.add_argument("-n", "--number", type=int, default=20, help="每轮解析次数")
+    args = parser.parse_args()
+
+    print(f"当前解析器: {bf.HTML_PARSER}")
+    print(f"{'调用点':<14}{'大小':>9}{'整页(ms)':>11}{'子树(ms)':>11}{'调用点(ms)':>12}{'加速':>8}")
+
+    for filename, label, strainer, call_site in CALL_SITES:
+        path = os.path.join(args.pages, filename)
+        if not os.path.exists(path):
+            print(f"{label:<14}  缺少 {filename}，跳过")
+            continue
+
+        with open(path, "rb") as f:
+            content = f.read()
+
+        full = best_ms(lambda: BeautifulSoup(content, "html.parser"), args.number)
+        scoped = best_ms(lambda: bf.parse_html(content, strainer), args.number)
+        site = best_ms(lambda: call_site(content), args.number)
+        print(f"{label:<14}{len(content) // 1024:>7}KB{full:>11.2f}{scoped:>11.2f}{site:>12.2f}{full / scoped:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()